@@ -0,0 +1,72 @@
+"""
+Compare the data file codecs on synthetic datasets.
+
+    python -m benchmarks.bench_codecs [record_count ...]
+
+For each size and codec it reports file size, write time (encode + atomic write)
+and parse time (read + decode), using application-like records.
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+from datetime import datetime, timedelta
+from utils.data_helpers import encode_records, decode_records, _atomic_write
+
+CODECS = ("pretty", "compact", "packed")
+SKILLS = ["Maid", "Cook", "Driver", "Cleaner", "Babysitter", "Gardener", "Security Guard", "Electrician", "Plumber"]
+
+
+def synthetic_applications(count, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [{
+        "job_id": rng.randint(1, count // 10 + 1),
+        "job_title": rng.choice(SKILLS),
+        "employer_id": rng.randint(1, count // 50 + 1),
+        "employer_name": f"Employer {rng.randint(1, 5000)}",
+        "applicant_id": rng.randint(1, count // 5 + 1),
+        "applicant_name": f"Seeker {rng.randint(1, 100000)}",
+        "applicant_phone": str(rng.randint(6000000000, 9999999999)),
+        "applicant_email": f"seeker{i}@example.com",
+        "applicant_skills": ", ".join(rng.sample(SKILLS, 3)),
+        "applicant_experience": rng.choice(["Fresher", "1-2 years", "2-5 years", "5+ years"]),
+        "expected_salary": rng.randrange(5000, 100000, 1000),
+        "id": i + 1,
+        "applied_date": (start + timedelta(minutes=i)).isoformat(),
+        "status": rng.choice(["pending", "accepted", "rejected"]),
+    } for i in range(count)]
+
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            records = synthetic_applications(count)
+            for codec in CODECS:
+                path = os.path.join(tmp, f"applications.{codec}")
+                write_s = best_of(lambda: _atomic_write(path, encode_records(records, codec)))
+
+                def parse():
+                    with open(path, "rb") as f:
+                        decode_records(f.read())
+
+                rows.append((count, codec, os.path.getsize(path), write_s, best_of(parse)))
+    return rows
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    print(f"{'records':>9} {'codec':>8} {'size (MB)':>10} {'write (ms)':>11} {'parse (ms)':>11}")
+    for count, codec, size, write_s, parse_s in run(sizes):
+        print(f"{count:>9} {codec:>8} {size / 1e6:>10.2f} {write_s * 1000:>11.1f} {parse_s * 1000:>11.1f}")
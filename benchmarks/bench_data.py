@@ -0,0 +1,170 @@
+"""
+Time the data layer and each screen's data preparation on synthetic datasets.
+
+    python -m benchmarks.bench_data [--scale N ...] [--repeat N] [--out results.json] [--compare old.json]
+
+For every scale (number of users; applications match it, offers are a fifth
+and jobs a tenth) a data directory is generated with benchmarks.generate_data,
+then each case is run once on a cold cache and --repeat times warm. Results
+go to a JSON file so runs can be compared; --compare prints the warm-time
+ratio against an earlier results file.
+
+Runs use the JSON file storage. The screen cases repeat what the screen computes before rendering, since the
+screens themselves need a running Streamlit session.
+"""
+import os
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+from benchmarks.generate_data import generate, PASSWORD
+from utils import data_helpers
+from utils.data_helpers import invalidate_cache, read_json
+from utils.auth import authenticate, get_complete_job_seekers
+from utils.applications import (get_applicant_applications, get_employer_applications, save_job_application,
+                                get_employer_application_counts, get_recent_employer_applications, get_employer_inbox)
+from utils.offers import get_live_offers, get_seeker_offers
+from utils.jobs import get_job_feed, filter_jobs, get_active_jobs, get_employer_jobs
+
+
+def browse_seekers(employer, seeker):
+    # screens/browse_seekers.py: seeker list, skill options, default filters
+    seekers = get_complete_job_seekers()
+    skills = sorted({skill for s in seekers for skill in s.get('job_types', [])})
+    return len(seekers), len(skills)
+
+
+def job_dashboard_feed(employer, seeker):
+    # screens/job_dashboard.py: joined feed with facet options, filters and applied split
+    feed = get_job_feed()
+    filtered, counts = filter_jobs(feed, location=feed['locations'][0], category='cook')
+    applied = {(a.get('job_id'), str(a.get('employer_id'))) for a in get_applicant_applications(seeker['id'])}
+    return len(filtered), len(applied)
+
+
+def job_dashboard_offers(employer, seeker):
+    return len(get_live_offers(seeker['id']))
+
+
+def hire_dashboard(employer, seeker):
+    jobs = get_employer_jobs(employer['id'])
+    counts = get_employer_application_counts(employer['id'])
+    recent = get_recent_employer_applications(employer['id'], 3)
+    return len(jobs), counts, len(recent)
+
+
+def view_applications(employer, seeker):
+    # first page of each status tab, with dates parsed for the visible cards only
+    counts = get_employer_application_counts(employer['id'])
+    tabs = [get_employer_inbox(employer['id'], s, 0, 20) for s in ("pending", "accepted", "rejected")]
+    dates = [datetime.fromisoformat(a['applied_date']) for tab in tabs for a in tab]
+    return counts, len(dates)
+
+
+def my_applications(employer, seeker):
+    return len(get_applicant_applications(seeker['id'])), len(get_seeker_offers(seeker['id']))
+
+
+def login(employer, seeker):
+    return authenticate(seeker['phone'], PASSWORD, 'job') is not None
+
+
+def apply_for_job(employer, seeker):
+    return save_job_application({'job_id': 1, 'job_title': 'Cook', 'employer_id': employer['id'],
+                                 'employer_name': employer.get('company_name'), 'applicant_id': seeker['id'],
+                                 'applicant_name': seeker['name'], 'applicant_phone': seeker['phone'],
+                                 'applicant_email': seeker['email']})
+
+
+CASES = {
+    "auth.get_complete_job_seekers": lambda e, s: len(get_complete_job_seekers()),
+    "auth.authenticate": login,
+    "applications.get_applicant_applications": lambda e, s: len(get_applicant_applications(s['id'])),
+    "applications.get_employer_applications": lambda e, s: len(get_employer_applications(e['id'])),
+    "applications.save_job_application": apply_for_job,
+    "offers.get_live_offers": job_dashboard_offers,
+    "jobs.get_active_jobs": lambda e, s: len(get_active_jobs()),
+    "screen.browse_seekers": browse_seekers,
+    "screen.job_dashboard": job_dashboard_feed,
+    "screen.hire_dashboard": hire_dashboard,
+    "screen.view_applications": view_applications,
+    "screen.my_applications": my_applications,
+}
+
+
+def _time(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def _sample_users():
+    users = read_json("data/users.json")
+    # the employer with the most applications and a seeker with a complete profile
+    counts = {}
+    for app in read_json("data/applications.json"):
+        counts[app['employer_id']] = counts.get(app['employer_id'], 0) + 1
+    employer = next(u for u in users if u['id'] == max(counts, key=counts.get))
+    seeker = next(u for u in users if u['role'] == 'job' and u.get('profile_completion') == 100)
+    return employer, seeker
+
+
+def run(scales, repeat=5, cases=None):
+    results = []
+    cwd = os.getcwd()
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate(tmp, users=scale, applications=scale, offers=scale // 5, jobs=scale // 10)
+            os.chdir(tmp)
+            try:
+                invalidate_cache()
+                employer, seeker = _sample_users()
+                for name, fn in CASES.items():
+                    if cases and name not in cases:
+                        continue
+                    invalidate_cache()
+                    cold = _time(fn, employer, seeker)
+                    warm = [_time(fn, employer, seeker) for _ in range(repeat)]
+                    results.append({"scale": scale, "case": name, "cold_ms": cold * 1000,
+                                    "warm_ms": statistics.median(warm) * 1000, "warm_min_ms": min(warm) * 1000})
+            finally:
+                os.chdir(cwd)
+                invalidate_cache()
+    return results
+
+
+def compare(results, old_path):
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = {(r["scale"], r["case"]): r for r in json.load(f)["results"]}
+    print(f"\n{'scale':>9} {'case':<42} {'old (ms)':>10} {'new (ms)':>10} {'ratio':>7}")
+    for r in results:
+        before = old.get((r["scale"], r["case"]))
+        if before:
+            ratio = r["warm_ms"] / before["warm_ms"] if before["warm_ms"] else float("inf")
+            print(f"{r['scale']:>9} {r['case']:<42} {before['warm_ms']:>10.2f} {r['warm_ms']:>10.2f} {ratio:>7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the data layer on synthetic data")
+    parser.add_argument("--scale", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--case", nargs="+", help="only run these cases")
+    parser.add_argument("--out", default="bench_data_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = run(args.scale, args.repeat, args.case)
+    print(f"{'scale':>9} {'case':<42} {'cold (ms)':>10} {'warm (ms)':>10}")
+    for r in results:
+        print(f"{r['scale']:>9} {r['case']:<42} {r['cold_ms']:>10.2f} {r['warm_ms']:>10.2f}")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"created_at": datetime.now().isoformat(), "python": platform.python_version(),
+                   "codec": data_helpers.CODEC,
+                   "results": results}, f, indent=4)
+    print(f"Results written to {args.out}")
+    if args.compare:
+        compare(results, args.compare)
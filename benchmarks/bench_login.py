@@ -0,0 +1,43 @@
+"""
+Login throughput at different scrypt cost parameters.
+
+    python -m benchmarks.bench_login [concurrent_logins]
+
+For each N it hashes one password, then runs concurrent_logins verifications
+from as many threads (like simultaneous sessions) through the bounded KDF pool
+and reports logins/second and the median and p95 latency seen by a session.
+"""
+import sys
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from utils import passwords
+
+COSTS = (2 ** 12, 2 ** 13, 2 ** 14, 2 ** 15)
+
+
+def run(concurrent_logins):
+    rows = []
+    for n in COSTS:
+        stored = passwords._hash("Abcdef123@", n=n)
+
+        def login():
+            started = time.perf_counter()
+            assert passwords.verify_password("Abcdef123@", stored)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrent_logins) as sessions:
+            latencies = sorted(sessions.map(lambda _: login(), range(concurrent_logins)))
+        elapsed = time.perf_counter() - started
+        rows.append((n, concurrent_logins / elapsed, statistics.median(latencies),
+                     latencies[int(len(latencies) * 0.95) - 1]))
+    return rows
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    print(f"KDF workers: {passwords.KDF_WORKERS}, concurrent logins: {count}")
+    print(f"{'N':>7} {'logins/s':>9} {'median (ms)':>12} {'p95 (ms)':>9}")
+    for n, rate, median, p95 in run(count):
+        print(f"{n:>7} {rate:>9.1f} {median * 1000:>12.1f} {p95 * 1000:>9.1f}")
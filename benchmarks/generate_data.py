@@ -0,0 +1,133 @@
+"""
+Generate a synthetic JobHub data directory at a chosen scale.
+
+    python -m benchmarks.generate_data out_dir [--users N] [--applications N] [--offers N] [--jobs N] [--seed N]
+
+Writes out_dir/data/{users,jobs,applications,job_offers,demo_jobs}.json in the
+configured codec. Roughly one user in ten is an employer and most seekers have a
+complete profile. Every user's password is "Abcdef123@", hashed once and shared
+so generation stays fast.
+"""
+import os
+import random
+import argparse
+from datetime import datetime, timedelta
+from utils.data_helpers import encode_records, _atomic_write
+from utils.passwords import hash_password
+
+PASSWORD = "Abcdef123@"
+SKILLS = ["Cook", "Maid", "Plumber", "Electrician", "Babysitter", "Gardener", "Driver", "Cleaner", "Security Guard"]
+CITIES = ["Indore", "Bhopal", "Pune", "Mumbai", "Delhi", "Jaipur", "Nagpur", "Ujjain", "Dewas", "Mhow"]
+EXPERIENCE = ["Fresher", "1-2 years", "2-5 years", "5+ years"]
+HOURS = ["Full Time", "Part Time", "Live-in"]
+START = datetime(2025, 1, 1)
+
+
+def _users(rng, count, password):
+    users = []
+    for i in range(1, count + 1):
+        user = {"id": i, "name": f"User {i}", "phone": str(6000000000 + i), "email": f"user{i}@example.com",
+                "password": password, "gender": rng.choice(["Male", "Female"]),
+                "city": rng.choice(CITIES), "address": f"{rng.randint(1, 999)} Main Road",
+                "availability_status": "available", "created_at": (START + timedelta(minutes=i)).isoformat(),
+                "version": 1}
+        if i % 10 == 1:
+            user.update(role="hire", company_name=f"Company {i}", company_type="Household",
+                        business_description="Household services")
+            user["profile_completion"] = 100
+        else:
+            user.update(role="job", experience=rng.choice(EXPERIENCE), job_types=rng.sample(SKILLS, 2),
+                        expected_salary=rng.randrange(5000, 100000, 1000), availability=[rng.choice(HOURS)])
+            if rng.random() < 0.8:
+                user.update(aadhaar=str(rng.randint(10 ** 11, 10 ** 12 - 1)), pincode=str(rng.randint(452001, 452020)))
+            user["profile_completion"] = 100 if "aadhaar" in user else 82
+        users.append(user)
+    return users
+
+
+def _jobs(rng, count, employers):
+    return [{"id": i, "title": skill, "location": rng.choice(CITIES), "salary": rng.randrange(5000, 60000, 1000),
+             "job_types": [skill], "experience": rng.choice(EXPERIENCE + ["Any"]), "working_hours": rng.choice(HOURS),
+             "urgency": "Normal", "contract_type": "Permanent", "description": f"Need a {skill.lower()}",
+             "requirements": "None", "benefits": "None", "employer_id": rng.choice(employers)["id"],
+             "posted_date": (START + timedelta(minutes=i)).isoformat(),
+             "status": "active" if rng.random() < 0.9 else "closed", "applications_count": 0}
+            for i, skill in ((i, rng.choice(SKILLS)) for i in range(1, count + 1))]
+
+
+def _applications(rng, count, jobs, seekers, employers_by_id):
+    apps = []
+    for i in range(1, count + 1):
+        job, seeker = rng.choice(jobs), rng.choice(seekers)
+        status = rng.choice(["pending", "pending", "accepted", "rejected"])
+        app = {"job_id": job["id"], "job_title": job["title"], "employer_id": job["employer_id"],
+               "employer_name": employers_by_id[job["employer_id"]]["company_name"],
+               "applicant_id": seeker["id"], "applicant_name": seeker["name"], "applicant_phone": seeker["phone"],
+               "applicant_email": seeker["email"], "applicant_skills": ", ".join(seeker["job_types"]),
+               "applicant_experience": seeker["experience"], "expected_salary": seeker["expected_salary"],
+               "id": i, "applied_date": (START + timedelta(minutes=3 * i)).isoformat(), "status": status}
+        if status != "pending":
+            app.update(response_date=(START + timedelta(minutes=3 * i + 60)).isoformat(), response_message=status.title())
+        apps.append(app)
+    return apps
+
+
+def _offers(rng, count, seekers, employers, now):
+    offers = []
+    for i in range(1, count + 1):
+        seeker, employer = rng.choice(seekers), rng.choice(employers)
+        # spread offer dates over the last few days so some pending offers are still live
+        offered = now - timedelta(hours=rng.uniform(0, 96))
+        offers.append({"job_title": rng.choice(SKILLS), "job_description": "Synthetic offer", "location": seeker["city"],
+                       "salary_offered": rng.randrange(5000, 60000, 1000), "job_type": rng.choice(SKILLS),
+                       "working_hours": rng.choice(HOURS), "start_date": offered.date().isoformat(),
+                       "personal_message": "Please join", "employer_id": employer["id"],
+                       "employer_name": employer["company_name"], "employer_phone": employer["phone"],
+                       "employer_email": employer["email"], "job_seeker_id": seeker["id"],
+                       "job_seeker_name": seeker["name"], "job_seeker_phone": seeker["phone"],
+                       "job_seeker_email": seeker["email"], "id": i, "offered_date": offered.isoformat(),
+                       "status": rng.choice(["pending", "pending", "accepted", "rejected"]),
+                       "expires_at": (offered + timedelta(hours=48)).isoformat()})
+    return offers
+
+
+def _demo_jobs(rng):
+    return [{"id": f"demo{i}", "title": skill, "company": "Demo Services", "location": rng.choice(CITIES),
+             "salary": rng.randrange(8000, 30000, 1000), "job_types": [skill], "contact": "9000000000",
+             "description": f"Demo {skill.lower()} job"} for i, skill in enumerate(SKILLS, 1)]
+
+
+def generate(out_dir, users=10_000, applications=10_000, offers=2_000, jobs=1_000, seed=42):
+    """Write a synthetic data directory under out_dir; returns {collection: record count}"""
+    rng = random.Random(seed)
+    all_users = _users(rng, users, hash_password(PASSWORD))
+    employers = [u for u in all_users if u["role"] == "hire"]
+    seekers = [u for u in all_users if u["role"] == "job"]
+    all_jobs = _jobs(rng, jobs, employers)
+    collections = {
+        "users": all_users,
+        "jobs": all_jobs,
+        "applications": _applications(rng, applications, all_jobs, seekers, {e["id"]: e for e in employers}),
+        "job_offers": _offers(rng, offers, seekers, employers, datetime.now()),
+        "demo_jobs": _demo_jobs(rng),
+    }
+    data_dir = os.path.join(out_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    for name, records in collections.items():
+        _atomic_write(os.path.join(data_dir, f"{name}.json"), encode_records(records))
+    return {name: len(records) for name, records in collections.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic JobHub data directory")
+    parser.add_argument("out_dir")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--applications", type=int, default=10_000)
+    parser.add_argument("--offers", type=int, default=2_000)
+    parser.add_argument("--jobs", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    counts = generate(args.out_dir, args.users, args.applications, args.offers, args.jobs, args.seed)
+    for name, count in counts.items():
+        print(f"{name}: {count} records written to {os.path.join(args.out_dir, 'data')}")
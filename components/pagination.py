@@ -0,0 +1,42 @@
+import os
+import streamlit as st
+
+PAGE_SIZE = int(os.environ.get("JOBHUB_PAGE_SIZE", 20))
+
+def _go_to(state_key, page):
+    st.session_state[state_key] = page
+
+def page_window(key, total, page_size=PAGE_SIZE, reset=True):
+    """
+    Show page controls for total items and return the (start, stop) of the current page.
+
+    The page number lives in st.session_state under f"{key}_page" and goes back
+    to the first page whenever total changes (a filter was changed) unless reset
+    is False, so callers only fetch and build widgets for the visible cards.
+    """
+    pages = max(1, -(-total // page_size))
+    state_key, total_key = f"{key}_page", f"{key}_total"
+    if reset and st.session_state.get(total_key) != total:
+        st.session_state[total_key] = total
+        st.session_state[state_key] = 1
+    page = min(max(st.session_state.get(state_key, 1), 1), pages)
+    start = (page - 1) * page_size
+
+    if pages > 1:
+        prev_col, info_col, next_col = st.columns([1, 3, 1])
+        with prev_col:
+            st.button("◀ Previous", key=f"{key}_prev", disabled=page == 1, use_container_width=True,
+                      on_click=_go_to, args=(state_key, page - 1))
+        with info_col:
+            st.markdown(f"<div style='text-align:center; padding-top:6px;'>Page <b>{page}</b> of {pages} "
+                        f"· showing {start + 1}–{min(start + page_size, total)} of {total}</div>",
+                        unsafe_allow_html=True)
+        with next_col:
+            st.button("Next ▶", key=f"{key}_next", disabled=page == pages, use_container_width=True,
+                      on_click=_go_to, args=(state_key, page + 1))
+    return start, min(start + page_size, total)
+
+def paginate(items, key, page_size=PAGE_SIZE):
+    """Show page controls for items and return only the current page's slice"""
+    start, stop = page_window(key, len(items), page_size)
+    return items[start:stop]
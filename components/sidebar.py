@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.auth import calculate_profile_completion, update_user_profile
+from utils.auth import profile_completion, update_user_profile
 
 def render_sidebar():
     
@@ -52,8 +52,7 @@ def render_sidebar():
                 key="sidebar_status_change"
             )
             if new_status != current_status:
-                update_user_profile(user['id'], {'availability_status': new_status})
-                st.session_state.current_user['availability_status'] = new_status
+                st.session_state.current_user = update_user_profile(user['id'], {'availability_status': new_status}) or user
                 st.success("Status updated!")
                 st.rerun()
 
@@ -68,7 +67,7 @@ def render_sidebar():
             </div>
             """, unsafe_allow_html=True)
 
-        completion = calculate_profile_completion(user)
+        completion = profile_completion(user)
         st.markdown(f"""
         <div style=" margin: 10px 0; padding: 8px; background: #f0f2f6; border-radius: 8px;">
             <div style="font-size: 1rem; color: #666; margin-bottom: 2px;">Profile Completion</div>
@@ -1,7 +1,9 @@
 import streamlit as st
 import base64
 import os
-from utils.data_helpers import cleanup_user_data
+from utils.migrations import ensure_migrated
+from utils.offers import start_expiry_sweeper
+from utils.auth import fresh_user
 from components.sidebar import render_sidebar
 from screens.home import home_page 
 from screens.auth_choice import auth_choice_page
@@ -74,11 +76,15 @@ def main():
     )
 
 
+    ensure_migrated()
+    start_expiry_sweeper()
+
+    if st.session_state.current_user:
+        st.session_state.current_user = fresh_user(st.session_state.current_user)
+        if st.session_state.current_user is None:
+            st.session_state.page = "home"
     if st.session_state.current_user:
         render_sidebar()
-    if 'data_cleaned' not in st.session_state:
-        cleanup_user_data()
-        st.session_state.data_cleaned = True
 
     page = st.session_state.page
 
@@ -1,19 +1,14 @@
 import datetime
 import streamlit as st
-from utils.auth import calculate_profile_completion
+from utils.auth import get_complete_job_seekers, seeker_salary_bounds
 from utils.applications import get_job_applications
-from utils.offers import get_job_offers
-from utils.data_helpers import read_json
+from utils.offers import latest_offer_time
+from components.pagination import paginate
 from datetime import datetime as dt  
 
-def get_job_seekers():
-    """Get all job seekers with complete profiles"""
-    users = read_json("data/users.json")
-    job_seekers = []
-    for user in users:
-        if user.get('role') == 'job' and calculate_profile_completion(user) == 100:
-            job_seekers.append(user)
-    return job_seekers
+def get_job_seekers(salary_range=None):
+    """Get all job seekers with complete profiles, optionally only those expecting a salary in salary_range"""
+    return get_complete_job_seekers(salary_range)
 
 def browse_job_seekers_page():
     """Job seeker cards with clean native Streamlit styling and background colors"""
@@ -27,7 +22,7 @@ def browse_job_seekers_page():
         st.info("No job seekers with complete profiles found.")
         return
 
-    cols = st.columns(3)
+    cols = st.columns([2, 2, 2, 3])
     with cols[0]:
         skill_filter = st.selectbox(
             "Filter by Skills",
@@ -46,8 +41,17 @@ def browse_job_seekers_page():
             ["All", "available", "busy", "not_available"],
             key="availability_filter"
         )
+    with cols[3]:
+        min_sal, max_sal = seeker_salary_bounds()
+        if min_sal < max_sal:
+            salary_range = st.slider("Expected Salary (₹)", int(min_sal), int(max_sal),
+                                     (int(min_sal), int(max_sal)), step=1000)
+        else:
+            salary_range = (min_sal, max_sal)
 
     filtered = seekers
+    if tuple(salary_range) != (min_sal, max_sal):
+        filtered = get_job_seekers(salary_range)
     if skill_filter != "All":
         filtered = [s for s in filtered if skill_filter in s.get('job_types', [])]
     if exp_filter != "All":
@@ -57,14 +61,13 @@ def browse_job_seekers_page():
 
     st.write(f"**Found {len(filtered)} job seekers**")
 
-    all_offers = get_job_offers()
-
-    for i in range(0, len(filtered), 2):
+    page = paginate(filtered, "seekers")
+    for i in range(0, len(page), 2):
         cols = st.columns(2, gap="medium")
         
         for j, col in enumerate(cols):
-            if i + j < len(filtered):
-                seeker = filtered[i + j]
+            if i + j < len(page):
+                seeker = page[i + j]
                 
                 with col:
                     status = seeker.get('availability_status', 'available')
@@ -143,13 +146,11 @@ def browse_job_seekers_page():
 
                     st.markdown(html_card, unsafe_allow_html=True)
                     recent = None
-                    for o in all_offers:
-                        if o.get("employer_id") == user["id"] and o.get("job_seeker_id") == seeker["id"]:
-                            odt = dt.fromisoformat(o["offered_date"])
-                            delta = datetime.datetime.now() - odt
-                            if delta.total_seconds() < 24*3600:
-                                recent = delta
-                                break
+                    offered_at = latest_offer_time(user["id"], seeker["id"])
+                    if offered_at is not None:
+                        delta = datetime.datetime.now() - dt.fromtimestamp(offered_at)
+                        if delta.total_seconds() < 24*3600:
+                            recent = delta
                     
                     action_col1, action_col2 = st.columns(2)
                     
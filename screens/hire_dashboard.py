@@ -1,10 +1,11 @@
 import streamlit as st
-from utils.applications import get_job_applications
-from utils.auth import calculate_profile_completion
+from utils.applications import get_employer_application_counts, get_recent_employer_applications
+from utils.auth import profile_completion
+from utils.jobs import get_employer_jobs
 
 def hire_dashboard():
     user = st.session_state.current_user
-    completion = calculate_profile_completion(user)
+    completion = profile_completion(user)
 
     st.title("🏢 Employer Dashboard")
     st.subheader(f"Welcome back, {user['name']}! 👋")
@@ -29,32 +30,22 @@ def hire_dashboard():
 
     st.markdown("---")
 
-    applications = get_job_applications()
-    my_applications = [
-        app for app in applications
-        if str(app.get("employer_id")) == str(user["id"])
-    ]
-    my_jobs = user.get("job_postings", [])
+    counts = get_employer_application_counts(user["id"])
+    my_jobs = get_employer_jobs(user["id"])
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Jobs Posted", len(my_jobs))
     with col2:
-        st.metric("Total Applications", len(my_applications))
+        st.metric("Total Applications", counts["total"])
     with col3:
-        pending_apps = len([app for app in my_applications if app.get("status") == "pending"])
-        st.metric("Pending Applications", pending_apps)
+        st.metric("Pending Applications", counts["pending"])
     with col4:
-        accepted_apps = len([app for app in my_applications if app.get("status") == "accepted"])
-        st.metric("Accepted", accepted_apps)
+        st.metric("Accepted", counts["accepted"])
 
     st.markdown("---")
     st.subheader("📨 Recent Applications")
-    recent_applications = sorted(
-        my_applications,
-        key=lambda x: x.get("applied_date", ""),
-        reverse=True
-    )[:3]
+    recent_applications = get_recent_employer_applications(user["id"], 3)
 
     if recent_applications:
         for app in recent_applications:
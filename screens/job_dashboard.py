@@ -1,15 +1,14 @@
 import time
 import streamlit as st
-from utils.data_helpers import read_json
-from utils.applications import get_job_applications, save_job_application
-from utils.offers import get_job_offers, update_offer_status
-from datetime import datetime
-from utils.auth import calculate_profile_completion
-from utils.jobs import get_demo_jobs
+from utils.applications import get_applicant_applications, save_job_application
+from utils.offers import get_live_offers, offer_expires_in, update_offer_status
+from utils.auth import profile_completion
+from utils.jobs import get_job_feed, filter_jobs
+from components.pagination import paginate
 
 def job_dashboard():
     user = st.session_state.current_user
-    completion = calculate_profile_completion(user)
+    completion = profile_completion(user)
 
     st.markdown(f"""
         <div style="text-align:center;">
@@ -27,20 +26,12 @@ def job_dashboard():
         st.markdown("---")
         return
 
-    def is_active(o):
-        try:
-            expires = datetime.fromisoformat(o.get("expires_at", datetime.now().isoformat()))
-        except Exception:
-            expires = datetime.now()
-        return datetime.now() <= expires
-
-    active_offers = [o for o in get_job_offers() if o.get('job_seeker_id') == user['id'] and o.get('status') == 'pending' and is_active(o)]
+    active_offers = get_live_offers(user['id'])
     
     if active_offers:
         st.markdown("### 🎯 **Job Offers for You!**")
         for offer in active_offers:
-            expires = datetime.fromisoformat(offer.get("expires_at", datetime.now().isoformat()))
-            hours_left = max(0, int((expires - datetime.now()).total_seconds() // 3600))
+            hours_left = max(0, int(offer_expires_in(offer) // 3600))
             st.markdown(f"""
                 <div style="border:3px solid #ff6b35; border-radius:15px; padding:20px; margin:10px 0;
                             background:linear-gradient(135deg, #fff5f5 0%, #ffe6e6 100%);">
@@ -65,69 +56,53 @@ def job_dashboard():
                     st.rerun()
         st.markdown("---")
 
-    users = read_json("data/users.json")
-    employers = [u for u in users if u.get('role') == 'hire']
-    
-    all_jobs = []
-    for job in get_demo_jobs():
-        job['employer_info'] = {'id':'demo','name':'Demo Employer','company':job['company'],'phone':job['contact'],'email':'demo@jobconnect.com'}
-        all_jobs.append(job)
-    for employer in employers:
-        for job in employer.get('job_postings', []):
-            if job.get('status') == 'active':
-                job['employer_info'] = {
-                    'id': employer['id'],
-                    'name': employer['name'],
-                    'company': employer.get('company_name', 'Company'),
-                    'phone': employer['phone'],
-                    'email': employer['email']
-                }
-                all_jobs.append(job)
+    feed = get_job_feed()
+    all_jobs = feed['jobs']
 
     if not all_jobs:
         st.info("📭 No job postings available at the moment. Please check back later!")
         return
 
-    default_categories = ["Cook","Maid","Plumber","Electrician","Babysitter","Gardener","Driver","Cleaner","Security Guard"]
-    job_categories_set = set(x.lower() for x in default_categories)
-    for job in all_jobs:
-        job_types = job.get('job_types', [])
-        if isinstance(job_types, str): job_types = [job_types]
-        job_categories_set.update(jt.strip().lower() for jt in job_types if jt)
-    display_job_categories = sorted(j.title() for j in job_categories_set)
-    display_to_lower = {j.title():j.lower() for j in job_categories_set}
-
-    locations = sorted(set(job.get('location', 'Not specified') for job in all_jobs))
-    companies = sorted(set(job['employer_info']['company'] for job in all_jobs))
-    salaries = [job.get('salary', 0) or 0 for job in all_jobs if 'salary' in job]
-    min_sal, max_sal = (min(salaries) if salaries else 0, max(salaries) if salaries else 0)
+    display_to_lower = feed['categories']
+    min_sal, max_sal = feed['min_salary'], feed['max_salary']
 
     c1, c2, c3, c4 = st.columns([2,2,2,4])
-    with c1:
-        location_filter = st.selectbox("By Location:", ["All"] + locations, index=0)
-    with c2:
-        job_category_filter = st.selectbox("Job Category:", ["All"] + display_job_categories, index=0)
-    with c3:
-        company_filter = st.selectbox("By Company:", ["All"] + companies, index=0)
+    # the slider goes first so the dropdown counts below can take it into account
     with c4:
         if min_sal < max_sal:
             salary_range = st.slider("Salary Range (₹):", int(min_sal), int(max_sal), (int(min_sal), int(max_sal)), step=1000)
         else:
             salary_range = (int(min_sal), int(max_sal))
 
-    selected_cat_lower = display_to_lower.get(job_category_filter, "all")
+    options = {"job_location_filter": ["All"] + list(feed['locations']),
+               "job_category_filter": ["All"] + list(display_to_lower),
+               "job_company_filter": ["All"] + list(feed['companies'])}
+    for key, values in options.items():
+        # the key is missing on a first visit, and a value can drop out of the feed between reruns
+        if st.session_state.setdefault(key, "All") not in values:
+            st.session_state[key] = "All"
+    location_filter = st.session_state["job_location_filter"]
+    job_category_filter = st.session_state["job_category_filter"]
+    company_filter = st.session_state["job_company_filter"]
+    filtered_jobs, counts = filter_jobs(feed, location_filter, display_to_lower.get(job_category_filter, "All"),
+                                        company_filter, salary_range)
+
+    def with_count(facet, key=None):
+        return lambda option: option if option == "All" else f"{option} ({counts[facet].get(key(option) if key else option, 0)})"
 
-    filtered_jobs = [job for job in all_jobs
-                    if (location_filter=="All" or job.get('location', 'Not specified') == location_filter) and
-                       (selected_cat_lower=="all" or selected_cat_lower in [jt.lower() for jt in (job.get('job_types') if isinstance(job.get('job_types'), list) else [job.get('job_types')]) if jt]) and
-                       (company_filter=="All" or job['employer_info']['company'] == company_filter) and
-                       (salary_range[0] <= (job.get('salary', 0) or 0) <= salary_range[1])
-                    ]
+    with c1:
+        st.selectbox("By Location:", options["job_location_filter"], key="job_location_filter",
+                     format_func=with_count('location'))
+    with c2:
+        st.selectbox("Job Category:", options["job_category_filter"], key="job_category_filter",
+                     format_func=with_count('category', display_to_lower.get))
+    with c3:
+        st.selectbox("By Company:", options["job_company_filter"], key="job_company_filter",
+                     format_func=with_count('company'))
 
     st.info(f"**Found {len(filtered_jobs)} job(s) matching your filters**")
 
-    applications = get_job_applications()
-    applied_set = {(app.get('job_id'), str(app.get('employer_id'))) for app in applications if app.get('applicant_id') == user['id']}
+    applied_set = {(app.get('job_id'), str(app.get('employer_id'))) for app in get_applicant_applications(user['id'])}
 
     applied_jobs, not_applied_jobs = [], []
     for job in filtered_jobs:
@@ -138,8 +113,9 @@ def job_dashboard():
 
     with tab_avail:
         if not_applied_jobs:
+            page = paginate(not_applied_jobs, "available_jobs")
             cols = st.columns(2)
-            for idx, job in enumerate(not_applied_jobs):
+            for idx, job in enumerate(page):
                 with cols[idx % 2]:
                     st.markdown(f"""
                         <div style="border:2px solid #ffff9d; border-radius:15px; background:#f9f9ec; padding:18px;
@@ -179,8 +155,9 @@ def job_dashboard():
 
     with tab_applied:
         if applied_jobs:
+            page = paginate(applied_jobs, "applied_jobs")
             cols = st.columns(2)
-            for idx, job in enumerate(applied_jobs):
+            for idx, job in enumerate(page):
                 with cols[idx % 2]:
                     st.markdown(f"""
                         <div style="border:2px solid #6c757d; border-radius:15px; background:#f0f0f0; padding:18px;
@@ -1,7 +1,6 @@
 import streamlit as st
-from utils.applications import get_job_applications
-from datetime import datetime
-from utils.offers import get_job_offers, update_offer_status
+from utils.applications import get_applicant_applications
+from utils.offers import get_seeker_offers, is_offer_expired, update_offer_status
 
 def my_applications_page():
     user = st.session_state.current_user
@@ -12,11 +11,8 @@ def my_applications_page():
     </div>
     """, unsafe_allow_html=True)
 
-    applications = get_job_applications()
-    offers = get_job_offers()
-
-    my_apps = [a for a in applications if a.get('applicant_id') == user['id']]
-    my_offs = [o for o in offers if o.get('job_seeker_id') == user['id']]
+    my_apps = get_applicant_applications(user['id'])
+    my_offs = get_seeker_offers(user['id'])
 
     st.markdown("""
     <style>
@@ -68,8 +64,7 @@ def my_applications_page():
         return map_status.get(status, ("#ffc107", "🟡 Pending", "status-pending"))
 
     def render_offer_card(offer, col):
-        expires = datetime.fromisoformat(offer.get("expires_at", datetime.now().isoformat()))
-        is_expired = datetime.now() > expires
+        is_expired = is_offer_expired(offer)
         border_color, status_text, status_class = render_status(offer.get("status", "pending"), is_expired)
 
         with col:
@@ -142,12 +137,13 @@ def my_applications_page():
                 sort_by = st.selectbox("Sort By", ["Date Applied", "Company", "Job Title"])
 
             filtered = my_apps if status_filter == "All" else [a for a in my_apps if a.get("status", "").title() == status_filter]
+            # applications come newest first already
             sort_keys = {
-                "Date Applied": lambda a: a.get("applied_date", ""),
                 "Company": lambda a: a.get("employer_name", ""),
                 "Job Title": lambda a: a.get("job_title", ""),
             }
-            filtered.sort(key=sort_keys.get(sort_by, sort_keys["Date Applied"]), reverse=(sort_by == "Date Applied"))
+            if sort_by in sort_keys:
+                filtered = sorted(filtered, key=sort_keys[sort_by])
             for i in range(0, len(filtered), 2):
                 cols = st.columns(2, gap="large")
                 render_application_card(filtered[i], cols[0])
@@ -1,22 +1,14 @@
 import streamlit as st
 from utils.auth import calculate_profile_completion, update_user_profile
-from utils.data_helpers import read_json, write_json
-from utils.validation import validate_email, validate_phone, validate_aadhaar
+from utils.data_helpers import write_json
+from utils.validation import (validate_email, validate_phone, validate_aadhaar, GENDER_OPTIONS, EXPERIENCE_OPTIONS,
+                              JOB_TYPE_OPTIONS, AVAILABILITY_OPTIONS, EDUCATION_OPTIONS, LANGUAGE_OPTIONS,
+                              COMPANY_TYPE_OPTIONS, MIN_SALARY, MAX_SALARY)
 import os
 
 DATA_FOLDER = "data"
 USERS_FILE = os.path.join(DATA_FOLDER, "users.json")
 
-def _load_current_user():
-    """Helper to reload current_user from disk after profile update."""
-    users = read_json(USERS_FILE)
-    uid = st.session_state.current_user["id"]
-    for u in users:
-        if u["id"] == uid:
-            st.session_state.current_user = u
-            return u
-    return st.session_state.current_user
-
 def profile_page():
     user = st.session_state.current_user
     st.title("👤 My Profile")
@@ -41,7 +33,7 @@ def job_seeker_profile():
             email = st.text_input("Email", value=user.get('email', ''), key="profile_email")
         
         with col2:
-            gender_options = ["Male", "Female", "Other"]
+            gender_options = GENDER_OPTIONS
             user_gender = user.get('gender', 'Male')
             if user_gender not in gender_options:
                 user_gender = 'Male'  
@@ -57,7 +49,7 @@ def job_seeker_profile():
         
         col1, col2 = st.columns(2)
         with col1:
-            exp_options = ["Fresher", "1-2 years", "2-5 years", "5+ years"]
+            exp_options = EXPERIENCE_OPTIONS
             user_exp = user.get('experience', 'Fresher')
             if user_exp not in exp_options:
                 user_exp = 'Fresher'  
@@ -66,24 +58,24 @@ def job_seeker_profile():
                                     index=exp_options.index(user_exp), key="profile_experience")
             
             job_types = st.multiselect("Job Types/Skills", 
-                                     ["Maid", "Cook", "Driver", "Cleaner", "Babysitter", "Gardener", "Security Guard", "Electrician", "Plumber","Other"],
+                                     JOB_TYPE_OPTIONS,
                                      default=user.get('job_types', []), key="profile_job_types")
         
         with col2:
             user_salary = user.get('expected_salary', 15000)
-            if not isinstance(user_salary, (int, float)) or user_salary < 5000:
+            if not isinstance(user_salary, (int, float)) or user_salary < MIN_SALARY:
                 user_salary = 15000  
-            elif user_salary > 100000:
-                user_salary = 100000  
+            elif user_salary > MAX_SALARY:
+                user_salary = MAX_SALARY  
             expected_salary = st.number_input("Expected Monthly Salary (₹)", 
-                                            min_value=5000, max_value=100000, 
+                                            min_value=MIN_SALARY, max_value=MAX_SALARY, 
                                             value=int(user_salary), step=1000, key="profile_salary")
             
             availability = st.multiselect("Availability", 
-                                        ["Full Time", "Part Time", "Weekends", "Night Shifts"],
+                                        AVAILABILITY_OPTIONS,
                                         default=user.get('availability', []), key="profile_availability")
         
-        edu_options = ["Primary", "Secondary", "Higher Secondary", "Graduate", "Post Graduate"]
+        edu_options = EDUCATION_OPTIONS
         user_edu = user.get('education', 'Secondary')
         if user_edu not in edu_options:
             user_edu = 'Secondary'  
@@ -92,7 +84,7 @@ def job_seeker_profile():
                                index=edu_options.index(user_edu), key="profile_education")
         
         languages = st.multiselect("Languages Known", 
-                                 ["Hindi", "English", "Tamil", "Telugu", "Bengali", "Marathi", "Gujarati"],
+                                 LANGUAGE_OPTIONS,
                                  default=user.get('languages', []), key="profile_languages")
     
     with tab3:
@@ -152,7 +144,7 @@ def employer_profile():
             email = st.text_input("Email", value=user.get('email', ''), key="employer_email")
         
         with col2:
-            gender_options = ["Male", "Female", "Other"]
+            gender_options = GENDER_OPTIONS
             user_gender = user.get('gender', 'Male')
             if user_gender not in gender_options:
                 user_gender = 'Male'  
@@ -169,7 +161,7 @@ def employer_profile():
         with col1:
             company_name = st.text_input("Company Name", value=user.get('company_name', ''), key="employer_company_name")
             
-            company_type_options = ["Family", "Small Business", "Medium Enterprise", "Large Corporation"]
+            company_type_options = COMPANY_TYPE_OPTIONS
             user_company_type = user.get('company_type', 'Family')
             if user_company_type not in company_type_options:
                 user_company_type = 'Family' 
@@ -1,7 +1,7 @@
 import streamlit as st
 from utils.validation import validate_email, validate_phone, validate_password
-from utils.auth import next_user_id
-from utils.data_helpers import read_json, write_json
+from utils.auth import phone_registered, email_registered, register_user
+from utils.passwords import hash_password
 import os
 from datetime import datetime
 
@@ -88,31 +88,30 @@ def signup_page():
                 if not is_valid:
                     st.error(error_msg)
                 else:
-                    users = read_json(USERS_FILE)
-                    if any(u["phone"] == phone_clean for u in users):
+                    if phone_registered(phone_clean):
                         st.error("Phone number already registered.")
-                    elif any(u["email"].lower() == email_clean.lower() for u in users):
+                    elif email_registered(email_clean):
                         st.error("Email already registered.")
                     else:
                         user = {
-                            "id": next_user_id(users), 
                             "role": st.session_state.role, 
                             "name": name_clean, 
                             "phone": phone_clean, 
                             "email": email_clean, 
                             "gender": gender, 
-                            "password": pwd_clean, 
+                            "password": hash_password(pwd_clean), 
                             "availability_status": "available", 
                             "created_at": datetime.now().isoformat()
                         }
                         if st.session_state.role == "hire" and company_name_clean:
                             user["company_name"] = company_name_clean
-                        users.append(user)
-                        write_json(USERS_FILE, users)
-                        st.success("Account created successfully!")
-                        st.session_state.current_user = user
-                        st.session_state.page = f"{user['role']}_dashboard"
-                        st.rerun()
+                        if register_user(user) is None:
+                            st.error("Phone number or email already registered.")
+                        else:
+                            st.success("Account created successfully!")
+                            st.session_state.current_user = user
+                            st.session_state.page = f"{user['role']}_dashboard"
+                            st.rerun()
     
     st.markdown("\n")
     st.markdown("".join(["─"] * 97),)
@@ -1,19 +1,57 @@
 import streamlit as st
-from utils.applications import get_job_applications, update_application_status
+from utils.applications import (get_employer_inbox, get_employer_application_counts,
+                                update_application_status, update_applications_status)
+from utils.jobs import get_employer_jobs
+from components.pagination import page_window
 from datetime import datetime
+from collections import Counter
 import html
 
+STATUSES = ["pending", "accepted", "rejected"]
+
 def view_applications_page():
     st.markdown("<h2 style='text-align:center;color:#1f77b4;'>📋 Manage Applications</h2><br>", unsafe_allow_html=True)
-    apps = [a for a in get_job_applications() if str(a.get('employer_id')) == str(st.session_state.current_user['id'])]
-    if not apps:
+    employer_id = st.session_state.current_user['id']
+    counts = get_employer_application_counts(employer_id)
+    if not counts["total"]:
         return st.info("No applications received yet.")
-    tabs = st.tabs([f"🟡 Pending ({sum(a['status']=='pending' for a in apps)})",
-                    f"🟢 Accepted ({sum(a['status']=='accepted' for a in apps)})",
-                    f"🔴 Rejected ({sum(a['status']=='rejected' for a in apps)})"])
-    for tab, status in zip(tabs, ["pending","accepted","rejected"]):
+    tabs = st.tabs([f"🟡 Pending ({counts['pending']})",
+                    f"🟢 Accepted ({counts['accepted']})",
+                    f"🔴 Rejected ({counts['rejected']})"])
+    for tab, status in zip(tabs, STATUSES):
         with tab:
-            display_grid([a for a in apps if a['status']==status], status=="pending")
+            # stay on the same page as cards are accepted or rejected out of the tab
+            start, stop = page_window(f"inbox_{status}", counts[status], reset=False)
+            tab_apps = get_employer_inbox(employer_id, status, start, stop - start)
+            if status == "pending" and tab_apps:
+                bulk_actions(employer_id, tab_apps)
+            display_grid(tab_apps, status=="pending")
+
+def bulk_actions(employer_id, apps):
+    with st.expander("⚡ Bulk Actions"):
+        labels = {a['id']: f"{a.get('applicant_name','N/A')} – {a.get('job_title','N/A')}" for a in apps}
+        selected = st.multiselect("Select applications on this page", list(labels), format_func=labels.get, key="bulk_selected")
+        # keyed by job_id: an employer can have several postings with the same title
+        titles = {a.get('job_id'): str(a.get('job_title','N/A')) for a in apps}
+        titles.update({j.get('id'): str(j.get('title','N/A')) for j in get_employer_jobs(employer_id)})
+        repeated = {t for t, n in Counter(titles.values()).items() if n > 1}
+        job_labels = {job_id: f"{t} (#{job_id})" if t in repeated else t for job_id, t in titles.items()}
+        job_id = st.selectbox("Job", sorted(job_labels, key=lambda j: (job_labels[j], str(j))),
+                              format_func=job_labels.get, key="bulk_job")
+        c1, c2 = st.columns(2)
+        if c1.button(f"✅ Accept selected ({len(selected)})", disabled=not selected, key="bulk_accept", use_container_width=True):
+            n = update_applications_status(selected, "accepted", "Accepted")
+            if n is None:
+                st.error("❌ Could not save the changes. Please try again.")
+            else:
+                st.success(f"✅ Accepted {n} application(s)"); st.rerun()
+        if c2.button(f"❌ Reject all pending for {job_labels[job_id]}", key="bulk_reject", use_container_width=True):
+            pending = get_employer_inbox(employer_id, "pending", job_id=job_id)
+            n = update_applications_status([a['id'] for a in pending], "rejected", "Rejected")
+            if n is None:
+                st.error("❌ Could not save the changes. Please try again.")
+            else:
+                st.info(f"❌ Rejected {n} application(s)"); st.rerun()
 
 def display_grid(apps, show_actions):
     if not apps:
@@ -1,32 +1,127 @@
 import os
+import bisect
 from datetime import datetime, timedelta
-from utils.data_helpers import read_json, write_json
+from utils.data_helpers import read_json, find_records, find_sorted, get_records, insert_record, update_record, next_id, transaction, cached_view, indexed_counts, STORAGE_BACKEND
 
 DATA_FOLDER = ""
 APPLICATIONS_FILE = os.path.join(DATA_FOLDER, "applications.json")
+STATUSES = ("pending", "accepted", "rejected")
+RECENT_LIMIT = 10
 
 def get_job_applications():
     """Get job applications data"""
     return read_json("data/applications.json")
 
+def get_employer_applications(employer_id):
+    """Get applications received by one employer"""
+    return find_records("data/applications.json", employer_id=employer_id)
+
+def get_applicant_applications(applicant_id):
+    """Get applications sent by one job seeker, newest first"""
+    return find_sorted("data/applications.json", "applied_date", applicant_id=applicant_id)
+
+def get_employer_inbox(employer_id, status, offset=0, limit=None, **criteria):
+    """One status tab of an employer's applications, newest first, a page at a time"""
+    return find_sorted("data/applications.json", "applied_date", offset, limit,
+                       employer_id=employer_id, status=status, **criteria)
+
 def save_job_application(application):
     """Save a new job application"""
-    applications = get_job_applications()
-    application['id'] = len(applications) + 1
+    application['id'] = next_id("data/applications.json")
     application['applied_date'] = datetime.now().isoformat()
     application['status'] = 'pending'
-    applications.append(application)
-    write_json("data/applications.json", applications)
-    return True
+    return insert_record("data/applications.json", application)
 
 def update_application_status(app_id, status, response_message=""):
     """Update application status (accept/reject)"""
-    applications = get_job_applications()
-    for i, app in enumerate(applications):
-        if app.get('id') == app_id:
-            applications[i]['status'] = status
-            applications[i]['response_date'] = datetime.now().isoformat()
-            applications[i]['response_message'] = response_message
-            write_json("data/applications.json", applications)
-            return True
-    return False
\ No newline at end of file
+    updated = update_record("data/applications.json", app_id, {
+        'status': status,
+        'response_date': datetime.now().isoformat(),
+        'response_message': response_message,
+    })
+    return updated is not None
+
+def update_applications_status(app_ids, status, response_message=""):
+    """Update the status of many applications with a single write; returns how many changed, or None if the write failed"""
+    try:
+        with transaction():
+            updated = [app_id for app_id in app_ids if update_application_status(app_id, status, response_message)]
+    except OSError:
+        return None
+    return len(updated)
+
+def _stats_entry(index, employer_id):
+    return index["employers"].setdefault(employer_id, {"total": 0, **{s: 0 for s in STATUSES}, "recent": []})
+
+def _count(index, app_id, employer_id, status, applied_date):
+    """Add an application to its employer's counters and recent list"""
+    stats = _stats_entry(index, employer_id)
+    stats["total"] += 1
+    stats[status] = stats.get(status, 0) + 1
+    index["apps"][app_id] = (employer_id, status, applied_date)
+    recent = stats["recent"]
+    # kept oldest first; only the newest RECENT_LIMIT stay
+    bisect.insort(recent, (applied_date, app_id))
+    if len(recent) > RECENT_LIMIT:
+        del recent[0]
+
+def _uncount(index, app_id):
+    employer_id, status, applied_date = index["apps"].pop(app_id)
+    stats = index["employers"][employer_id]
+    stats["total"] -= 1
+    stats[status] -= 1
+    if (applied_date, app_id) in stats["recent"]:
+        stats["recent"].remove((applied_date, app_id))
+
+def _build_employer_stats(apps):
+    """
+    Per-employer application counts by status and the RECENT_LIMIT newest (applied_date, id),
+    plus each application's (employer, status, applied_date) so updates can be applied
+    """
+    index = {"employers": {}, "apps": {}}
+    for app in sorted(apps, key=lambda a: (str(a.get('applied_date') or ""), a.get('id'))):
+        _count(index, app.get('id'), str(app.get('employer_id')), app.get('status', 'pending'),
+               str(app.get('applied_date') or ""))
+    return index
+
+def _update_employer_stats(index, old_apps, apps, events):
+    for event in events:
+        if event.get('op') == 'insert':
+            app = event['record']
+            if app.get('id') in index["apps"]:
+                _uncount(index, app.get('id'))
+            _count(index, app.get('id'), str(app.get('employer_id')), app.get('status', 'pending'),
+                   str(app.get('applied_date') or ""))
+        elif event.get('op') == 'update' and event.get('id') in index["apps"]:
+            changes = event.get('changes', {})
+            if not {'employer_id', 'status', 'applied_date'} & set(changes):
+                continue
+            employer_id, status, applied_date = index["apps"][event['id']]
+            _uncount(index, event['id'])
+            _count(index, event['id'], str(changes.get('employer_id', employer_id)), changes.get('status', status),
+                   str(changes.get('applied_date', applied_date) or ""))
+    return index
+
+def _employer_stats(employer_id):
+    index = cached_view("data/applications.json", "employer_stats", _build_employer_stats, _update_employer_stats)
+    return index["employers"].get(str(employer_id))
+
+def get_employer_application_counts(employer_id):
+    """{'total', 'pending', 'accepted', 'rejected'} counts of an employer's applications"""
+    counts = indexed_counts("data/applications.json", "status", employer_id=employer_id)
+    if counts is not None:
+        return {"total": sum(counts.values()), **{s: counts.get(s, 0) for s in STATUSES}}
+    stats = _employer_stats(employer_id)
+    if stats is None:
+        return {"total": 0, **{s: 0 for s in STATUSES}}
+    return {"total": stats["total"], **{s: stats.get(s, 0) for s in STATUSES}}
+
+def get_recent_employer_applications(employer_id, limit=3):
+    """An employer's newest applications (at most RECENT_LIMIT), newest first"""
+    if STORAGE_BACKEND == "sqlite":
+        # indexed by employer in SQL, no per-employer view needed
+        return find_sorted("data/applications.json", "applied_date", 0, min(limit, RECENT_LIMIT), employer_id=employer_id)
+    stats = _employer_stats(employer_id)
+    if stats is None:
+        return []
+    return get_records("data/applications.json", [app_id for _, app_id in reversed(stats["recent"][-limit:])])
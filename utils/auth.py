@@ -1,16 +1,131 @@
 from datetime import datetime, timedelta
-from utils.data_helpers import read_json, write_json
+from bisect import bisect_left, insort
+from utils.data_helpers import get_record, get_records, insert_record, update_record, cached_view, next_id, file_lock, indexed_ids
+from utils.passwords import hash_password, verify_password, needs_rehash
+from utils.validation import normalize_phone
+
+def _credential_keys(user):
+    return (("phone", user.get("role"), normalize_phone(user.get("phone"))),
+            ("name", user.get("role"), str(user.get("name", "")).lower()))
+
+def _index_user(index, user):
+    keys = _credential_keys(user)
+    index["keys"][user.get("id")] = keys
+    for key in keys:
+        index["ids"].setdefault(key, []).append(user.get("id"))
+
+def _unindex_user(index, user_id):
+    for key in index["keys"].pop(user_id, ()):
+        ids = [i for i in index["ids"].get(key, []) if i != user_id]
+        if ids:
+            index["ids"][key] = ids
+        else:
+            index["ids"].pop(key, None)
+
+def _build_credential_index(users):
+    """(kind, role, phone or lower-cased name) -> user ids, plus each id's current keys"""
+    index = {"ids": {}, "keys": {}}
+    for user in users:
+        _index_user(index, user)
+    return index
+
+def _update_credential_index(index, old_users, users, events):
+    for event in events:
+        if event.get("op") == "insert":
+            _unindex_user(index, event["record"].get("id"))
+            _index_user(index, event["record"])
+        elif event.get("op") == "update" and event.get("id") in index["keys"]:
+            changes = event.get("changes", {})
+            if not {"role", "phone", "name"} & set(changes):
+                continue
+            (_, role, phone), (_, _, name) = index["keys"][event["id"]]
+            _unindex_user(index, event["id"])
+            _index_user(index, {"id": event["id"], "role": changes.get("role", role),
+                                "phone": changes.get("phone", phone), "name": changes.get("name", name)})
+    return index
+
+def _credential_candidates(identifier, role):
+    """Ids of the users with this role whose name or phone matches identifier"""
+    phone = normalize_phone(identifier)
+    by_name = indexed_ids("data/users.json", role=role, name_key=identifier.lower())
+    if by_name is not None:
+        return by_name + (indexed_ids("data/users.json", role=role, phone_key=phone) if phone else [])
+    index = cached_view("data/users.json", "credentials", _build_credential_index, _update_credential_index)
+    return index["ids"].get(("name", role, identifier.lower()), []) + (index["ids"].get(("phone", role, phone), []) if phone else [])
 
 def authenticate(identifier, pwd, role):
-    users = read_json("data/users.json")
-    for u in users:
-        if u.get("role") == role and u.get("password") == pwd:
-            if identifier.lower() == u["name"].lower() or identifier == u["phone"]:
-                return u
+    candidates = _credential_candidates(identifier, role)
+    for user_id in dict.fromkeys(candidates):
+        u = get_record("data/users.json", user_id)
+        if u and u.get("role") == role and verify_password(pwd, u.get("password", "")):
+            if needs_rehash(u.get("password")):
+                # legacy plaintext (or an outdated work factor): upgrade it now that we know the password
+                return dict(update_user_profile(u["id"], {"password": hash_password(pwd)}) or u)
+            return dict(u)
     return None
 
-def next_user_id(users):
-    return max([u.get("id", 0) for u in users], default=0) + 1
+def next_user_id():
+    return next_id("data/users.json")
+
+def _contact_keys(phone, email):
+    return normalize_phone(phone), str(email or "").strip().lower()
+
+def _build_contact_index(users):
+    """Unique keys: phone -> user id and lower-cased email -> user id, plus each id's current keys"""
+    index = {"phone": {}, "email": {}, "keys": {}}
+    for user in users:
+        _index_contact(index, user.get("id"), user.get("phone"), user.get("email"))
+    return index
+
+def _index_contact(index, user_id, phone, email):
+    old = index["keys"].pop(user_id, None)
+    if old is not None:
+        for field, value in zip(("phone", "email"), old):
+            if index[field].get(value) == user_id:
+                del index[field][value]
+    phone, email = _contact_keys(phone, email)
+    index["keys"][user_id] = (phone, email)
+    if phone:
+        index["phone"].setdefault(phone, user_id)
+    if email:
+        index["email"].setdefault(email, user_id)
+
+def _update_contact_index(index, old_users, users, events):
+    for event in events:
+        if event.get("op") == "insert":
+            user = event["record"]
+            _index_contact(index, user.get("id"), user.get("phone"), user.get("email"))
+        elif event.get("op") == "update" and {"phone", "email"} & set(event.get("changes", {})):
+            changes = event["changes"]
+            phone, email = index["keys"].get(event.get("id"), ("", ""))
+            _index_contact(index, event.get("id"), changes.get("phone", phone), changes.get("email", email))
+    return index
+
+def _contact_index():
+    return cached_view("data/users.json", "contacts", _build_contact_index, _update_contact_index)
+
+def phone_registered(phone):
+    phone = _contact_keys(phone, None)[0]
+    ids = indexed_ids("data/users.json", phone_key=phone) if phone else []
+    return bool(ids) if ids is not None else phone in _contact_index()["phone"]
+
+def email_registered(email):
+    email = _contact_keys(None, email)[1]
+    ids = indexed_ids("data/users.json", email_key=email) if email else []
+    return bool(ids) if ids is not None else email in _contact_index()["email"]
+
+def register_user(user):
+    """Give a new user an id and store it; returns None if the phone or email got taken meanwhile"""
+    with file_lock("data/users.json"):
+        if phone_registered(user.get("phone")) or email_registered(user.get("email")):
+            return None
+        user["phone"] = normalize_phone(user.get("phone"))
+        user["id"] = next_user_id()
+        user["profile_completion"] = calculate_profile_completion(user)
+        user["version"] = 1
+        if not insert_record("data/users.json", user):
+            return None
+    return user
 
 def calculate_profile_completion(user):
     """Calculate profile completion percentage"""
@@ -22,12 +137,114 @@ def calculate_profile_completion(user):
     completed = sum(1 for field in required_fields if user.get(field))
     return int((completed / len(required_fields)) * 100)
 
+def profile_completion(user):
+    """Stored completion percentage, falling back to computing it for records saved before it was stored"""
+    stored = user.get('profile_completion')
+    return stored if isinstance(stored, int) else calculate_profile_completion(user)
+
+def _salary(value):
+    return value if isinstance(value, (int, float)) else 0
+
+def _build_complete_seekers(users):
+    """
+    Ids of all job seekers with their expected salary, (insertion-ordered) ids of those
+    with a 100% profile, and the complete ones as a sorted list of (salary, id)
+    """
+    seekers = {u.get('id'): _salary(u.get('expected_salary')) for u in users if u.get('role') == 'job'}
+    complete = {u.get('id'): None for u in users if u.get('role') == 'job' and profile_completion(u) == 100}
+    by_salary = sorted((seekers[user_id], user_id) for user_id in complete)
+    return {"seekers": seekers, "complete": complete, "by_salary": by_salary}
+
+def _unlist_salary(index, user_id):
+    entry = (index["seekers"][user_id], user_id)
+    i = bisect_left(index["by_salary"], entry)
+    if i < len(index["by_salary"]) and index["by_salary"][i] == entry:
+        del index["by_salary"][i]
+
+def _update_complete_seekers(index, old_users, users, events):
+    seekers, complete = index["seekers"], index["complete"]
+    for event in events:
+        if event.get('op') == 'insert':
+            user = event['record']
+            if user.get('id') in complete:
+                _unlist_salary(index, user.get('id'))
+                del complete[user.get('id')]
+            seekers.pop(user.get('id'), None)
+            if user.get('role') == 'job':
+                seekers[user.get('id')] = _salary(user.get('expected_salary'))
+                if profile_completion(user) == 100:
+                    complete[user.get('id')] = None
+                    insort(index["by_salary"], (seekers[user.get('id')], user.get('id')))
+        elif event.get('op') == 'update' and event.get('id') in seekers:
+            user_id, changes = event['id'], event.get('changes', {})
+            was_complete = user_id in complete
+            completion = changes.get('profile_completion')
+            now_complete = was_complete if completion is None else completion == 100
+            salary = _salary(changes['expected_salary']) if 'expected_salary' in changes else seekers[user_id]
+            moved = salary != seekers[user_id]
+            if was_complete and (moved or not now_complete):
+                _unlist_salary(index, user_id)
+            seekers[user_id] = salary
+            if now_complete and (moved or not was_complete):
+                insort(index["by_salary"], (salary, user_id))
+            if now_complete:
+                complete.setdefault(user_id, None)
+            else:
+                complete.pop(user_id, None)
+    return index
+
+def _complete_seekers():
+    return cached_view("data/users.json", "complete_seekers", _build_complete_seekers, _update_complete_seekers)
+
+def get_complete_job_seekers(salary_range=None):
+    """
+    Job seekers whose profile is 100% complete, read from a maintained set.
+
+    With salary_range=(low, high) only those expecting a salary in that range are
+    returned, lowest first, found by bisecting the sorted salary list.
+    """
+    index = _complete_seekers()
+    if salary_range is None:
+        ids = list(index["complete"])
+    else:
+        by_salary = index["by_salary"]
+        start = bisect_left(by_salary, (salary_range[0],))
+        end = bisect_left(by_salary, (salary_range[1], float("inf")), start)
+        ids = [user_id for _, user_id in by_salary[start:end]]
+    return get_records("data/users.json", ids)
+
+def seeker_salary_bounds():
+    """Lowest and highest expected salary among complete job seekers, (0, 0) if there are none"""
+    by_salary = _complete_seekers()["by_salary"]
+    return (by_salary[0][0], by_salary[-1][0]) if by_salary else (0, 0)
+
 def update_user_profile(user_id, updates):
-    """Update user profile in database"""
-    users = read_json("data/users.json")
-    for i, user in enumerate(users):
-        if user['id'] == user_id:
-            users[i].update(updates)
-            write_json("data/users.json", users)
-            return users[i]
-    return None
\ No newline at end of file
+    """Update user profile in database, refreshing its stored completion percentage and bumping its version"""
+    with file_lock("data/users.json"):
+        user = get_record("data/users.json", user_id)
+        if user is None:
+            return None
+        if "phone" in updates:
+            updates = {**updates, 'phone': normalize_phone(updates["phone"])}
+        updates = {**updates,
+                   'profile_completion': calculate_profile_completion({**user, **updates}),
+                   'version': user.get('version', 0) + 1}
+        return update_record("data/users.json", user_id, updates)
+
+def get_user(user_id):
+    """Fetch one user by id"""
+    return get_record("data/users.json", user_id)
+
+def fresh_user(session_user):
+    """
+    Return session_user if it is still current, otherwise a copy of the stored record.
+
+    Only compares version counters, so it is cheap enough to call on every rerun.
+    Returns None if the user no longer exists.
+    """
+    stored = get_user(session_user['id'])
+    if stored is None:
+        return None
+    if stored.get('version', 0) == session_user.get('version', 0):
+        return session_user
+    return dict(stored)
\ No newline at end of file
@@ -0,0 +1,324 @@
+"""
+Bulk import of job seekers, employers and job postings from partner files.
+
+    python -m utils.bulk_import users partners.csv [--batch-size 5000] [--rejects rejects.jsonl]
+    python -m utils.bulk_import jobs postings.jsonl
+
+Input is CSV (with a header row) or JSON Lines, chosen by file extension. Rows
+are streamed and validated one at a time and committed in batches, one
+transaction (a single log append per collection) per batch. Rows that fail
+validation are written with their line number and reason to the rejects file.
+
+Memory stays bounded by the batch size. With the JSON storage, phone and email
+duplicates are checked against a temporary on-disk SQLite index, seeded once
+from the existing users and kept current with other processes' writes through
+the users change log, instead of the cached users collection; automatic log
+compaction is held off until the import ends and then done once. With the
+SQLite storage the checks are indexed queries against the store itself.
+
+Plaintext passwords are hashed across the KDF pool, which dominates the run
+time for large user files; rows may instead carry ready-made scrypt$ hashes.
+"""
+import os
+import sys
+import csv
+import json
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime
+from utils import event_log
+from utils.data_helpers import (get_record, insert_record, reserve_ids, transaction, file_lock, load_records,
+                                deferred_compaction, STORAGE_BACKEND)
+from utils.validation import (validate_phone, validate_email, validate_aadhaar, normalize_phone, GENDER_OPTIONS,
+                              EXPERIENCE_OPTIONS, JOB_TYPE_OPTIONS, AVAILABILITY_OPTIONS, EDUCATION_OPTIONS,
+                              LANGUAGE_OPTIONS, COMPANY_TYPE_OPTIONS, AVAILABILITY_STATUSES, MIN_SALARY, MAX_SALARY)
+from utils.auth import phone_registered, email_registered, calculate_profile_completion, _contact_keys
+from utils.passwords import hash_passwords, is_hashed, is_valid_hash
+
+USERS_FILE = "data/users.json"
+JOBS_FILE = "data/jobs.json"
+BATCH_SIZE = 5000
+
+# CSV cells for these fields hold comma separated lists, or numbers
+LIST_FIELDS = ("work_type", "availability", "languages", "additional_skills", "job_types")
+INT_FIELDS = ("age", "expected_salary", "salary", "employer_id")
+# user fields limited to the choices the profile forms offer (single value, or a list of them)
+CHOICE_FIELDS = {"gender": GENDER_OPTIONS, "experience": EXPERIENCE_OPTIONS, "education": EDUCATION_OPTIONS,
+                 "company_type": COMPANY_TYPE_OPTIONS, "availability_status": AVAILABILITY_STATUSES}
+MULTI_CHOICE_FIELDS = {"job_types": JOB_TYPE_OPTIONS, "availability": AVAILABILITY_OPTIONS, "languages": LANGUAGE_OPTIONS}
+
+
+def read_rows(path):
+    """Yield (line number, row dict) from a CSV or JSON Lines file"""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, _from_csv(row)
+        else:
+            for line_num, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                yield line_num, row if isinstance(row, dict) else {"_invalid": line.strip()}
+
+
+def _from_csv(row):
+    row = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+    for field in LIST_FIELDS:
+        if field in row:
+            row[field] = [item.strip() for item in row[field].split(",") if item.strip()]
+    for field in INT_FIELDS:
+        if field in row:
+            try:
+                row[field] = int(row[field])
+            except ValueError:
+                pass
+    return row
+
+
+def _whole_number(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def check_user_fields(row):
+    """Return the reason a user row's choice or numeric fields are invalid, or None"""
+    for field, options in CHOICE_FIELDS.items():
+        if field in row and row[field] not in options:
+            return f"{field} must be one of: {', '.join(options)}"
+    for field, options in MULTI_CHOICE_FIELDS.items():
+        if field in row and (not isinstance(row[field], list) or any(v not in options for v in row[field])):
+            return f"{field} must be a list of: {', '.join(options)}"
+    if "expected_salary" in row and not (_whole_number(row["expected_salary"])
+                                         and MIN_SALARY <= row["expected_salary"] <= MAX_SALARY):
+        return f"expected_salary must be a whole number from {MIN_SALARY} to {MAX_SALARY}"
+    if "age" in row and not (_whole_number(row["age"]) and row["age"] > 0):
+        return "age must be a positive whole number"
+    return None
+
+
+def _snapshot_stamp():
+    try:
+        st = os.stat(USERS_FILE)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def _user_contacts(users):
+    """Yield the (kind, value) contact keys of users, as the signup checks normalise them"""
+    for user in users:
+        phone, email = _contact_keys(user.get("phone"), user.get("email"))
+        if phone:
+            yield "phone", phone
+        if email:
+            yield "email", email
+
+
+def open_contacts(tmp_dir):
+    """
+    Contact keys already in use, for duplicate checks during an import.
+
+    With the JSON storage they go to a temporary SQLite file in tmp_dir, seeded from the
+    current users and then only the new tail of the users log; with the SQLite storage
+    the store's own lookups are used and only the current batch is kept in memory.
+    """
+    contacts = {"conn": None, "batch": set()}
+    if STORAGE_BACKEND == "sqlite":
+        return contacts
+    conn = sqlite3.connect(os.path.join(tmp_dir, "contacts.db"), isolation_level=None)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("CREATE TABLE taken (kind TEXT, value TEXT, PRIMARY KEY (kind, value)) WITHOUT ROWID")
+    contacts.update(conn=conn, offset=0, snapshot=None)
+    with file_lock(USERS_FILE):
+        _catch_up(contacts)
+    return contacts
+
+
+def _catch_up(contacts):
+    """Add contacts stored by anyone since the index was last brought up to date; returns their keys"""
+    conn = contacts["conn"]
+    snapshot = _snapshot_stamp()
+    if snapshot != contacts["snapshot"] or event_log.log_size(USERS_FILE) < contacts["offset"]:
+        # first run, or another process compacted the log into the snapshot: rescan it all
+        contacts["snapshot"], contacts["offset"] = snapshot, event_log.log_size(USERS_FILE)
+        users = load_records(USERS_FILE)
+    else:
+        events, contacts["offset"] = event_log.read_events(USERS_FILE, contacts["offset"])
+        users = [e["record"] if e.get("op") == "insert" else e.get("changes", {}) for e in events]
+    keys = set()
+    for start in range(0, len(users), BATCH_SIZE):
+        chunk = list(_user_contacts(users[start:start + BATCH_SIZE]))
+        conn.executemany("INSERT OR IGNORE INTO taken VALUES (?, ?)", chunk)
+        keys.update(chunk)
+    return keys
+
+
+def _taken(contacts, kind, value):
+    if (kind, value) in contacts["batch"]:
+        return True
+    if contacts["conn"] is not None:
+        return contacts["conn"].execute("SELECT 1 FROM taken WHERE kind = ? AND value = ?", (kind, value)).fetchone() is not None
+    return phone_registered(value) if kind == "phone" else email_registered(value)
+
+
+def _claim(contacts, row):
+    keys = list(_user_contacts([row]))
+    if contacts["conn"] is not None:
+        contacts["conn"].executemany("INSERT OR IGNORE INTO taken VALUES (?, ?)", keys)
+    else:
+        contacts["batch"].update(keys)
+
+
+def check_user(row, contacts):
+    """Return the reason a user row cannot be imported, or None"""
+    if "_invalid" in row:
+        return "not a JSON object"
+    if row.get("role") not in ("job", "hire"):
+        return "role must be 'job' or 'hire'"
+    if not str(row.get("name", "")).strip():
+        return "name is required"
+    if not validate_phone(row.get("phone", "")):
+        return "invalid phone number"
+    if not validate_email(str(row.get("email", ""))):
+        return "invalid email address"
+    if row.get("aadhaar") and not validate_aadhaar(row["aadhaar"]):
+        return "invalid aadhaar number"
+    if not row.get("password"):
+        return "password is required"
+    if is_hashed(row["password"]) and not is_valid_hash(row["password"]):
+        return "malformed scrypt$ password hash"
+    reason = check_user_fields(row)
+    if reason:
+        return reason
+    phone, email = _contact_keys(row["phone"], row["email"])
+    if _taken(contacts, "phone", phone):
+        return "phone number already registered"
+    if _taken(contacts, "email", email):
+        return "email already registered"
+    return None
+
+
+def check_job(row):
+    """Return the reason a job posting row cannot be imported, or None"""
+    if "_invalid" in row:
+        return "not a JSON object"
+    if not str(row.get("title", "")).strip() or not str(row.get("location", "")).strip():
+        return "title and location are required"
+    if not isinstance(row.get("salary"), int) or row["salary"] <= 0:
+        return "salary must be a positive whole number"
+    employer = get_record(USERS_FILE, row.get("employer_id"))
+    if employer is None or employer.get("role") != "hire":
+        return "employer_id is not an employer"
+    return None
+
+
+def _commit_users(batch, contacts):
+    """Store a batch of checked (line number, row) pairs; returns the pairs that lost a race with another writer"""
+    passwords = [row["password"] for _, row in batch]
+    hashed = iter(hash_passwords([p for p in passwords if not is_hashed(p)]))
+    passwords = [p if is_hashed(p) else next(hashed) for p in passwords]
+    now = datetime.now().isoformat()
+    with file_lock(USERS_FILE), transaction():
+        # signups and edits committed since the rows were checked can have taken their phone or email
+        if contacts["conn"] is not None:
+            late = _catch_up(contacts)
+            lost = {n for n, row in batch if late.intersection(_user_contacts([row]))}
+        else:
+            lost = {n for n, row in batch if phone_registered(row["phone"]) or email_registered(row["email"])}
+        kept = [(row, password) for (n, row), password in zip(batch, passwords) if n not in lost]
+        for user_id, (row, password) in zip(reserve_ids(USERS_FILE, len(kept)), kept):
+            user = {**row,
+                    "id": user_id,
+                    "phone": normalize_phone(row["phone"]),
+                    "email": str(row["email"]).strip(),
+                    "password": password,
+                    "availability_status": row.get("availability_status", "available"),
+                    "created_at": row.get("created_at", now),
+                    "version": 1}
+            user["profile_completion"] = calculate_profile_completion(user)
+            insert_record(USERS_FILE, user)
+    contacts["batch"].clear()
+    return [(n, row) for n, row in batch if n in lost]
+
+
+def _commit_jobs(batch, contacts):
+    now = datetime.now().isoformat()
+    rows = [row for _, row in batch]
+    with transaction():
+        for job_id, row in zip(reserve_ids(JOBS_FILE, len(rows)), rows):
+            insert_record(JOBS_FILE, {**row,
+                                      "id": job_id,
+                                      "posted_date": row.get("posted_date", now),
+                                      "status": "active",
+                                      "applications_count": 0})
+    return []
+
+
+def import_file(kind, path, batch_size=BATCH_SIZE, rejects_path=None):
+    """Import users or jobs from path; returns (imported, rejected) counts"""
+    commit = _commit_users if kind == "users" else _commit_jobs
+    target = USERS_FILE if kind == "users" else JOBS_FILE
+    rejects_path = rejects_path or os.path.splitext(path)[0] + ".rejects.jsonl"
+    imported = rejected = 0
+    batch = []
+
+    with open(rejects_path, "w", encoding="utf-8") as rejects, tempfile.TemporaryDirectory() as tmp_dir, \
+            deferred_compaction(target):
+        contacts = open_contacts(tmp_dir) if kind == "users" else None
+
+        def reject(line_num, row, reason):
+            nonlocal rejected
+            rejected += 1
+            # the rejects file is handed back to partners, so it never carries passwords
+            shown = {k: v for k, v in row.items() if k != "password"}
+            rejects.write(json.dumps({"line": line_num, "reason": reason, "row": shown}, ensure_ascii=False) + "\n")
+
+        def flush():
+            nonlocal imported
+            if batch:
+                lost = commit(batch, contacts)
+                for line_num, row in lost:
+                    reject(line_num, row, "phone number or email registered during the import")
+                imported += len(batch) - len(lost)
+                batch.clear()
+
+        try:
+            for line_num, row in read_rows(path):
+                reason = check_user(row, contacts) if kind == "users" else check_job(row)
+                if reason:
+                    reject(line_num, row, reason)
+                    continue
+                if kind == "users":
+                    _claim(contacts, row)
+                batch.append((line_num, row))
+                if len(batch) >= batch_size:
+                    flush()
+            flush()
+        finally:
+            if contacts and contacts["conn"] is not None:
+                contacts["conn"].close()
+
+    if not rejected:
+        os.remove(rejects_path)
+    return imported, rejected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users or job postings from CSV or JSON Lines")
+    parser.add_argument("kind", choices=("users", "jobs"))
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--rejects", help="where to write rejected rows (default: <input>.rejects.jsonl)")
+    args = parser.parse_args()
+
+    imported, rejected = import_file(args.kind, args.path, args.batch_size, args.rejects)
+    print(f"{imported} {args.kind} imported, {rejected} rejected")
+    if rejected:
+        print(f"Rejected rows written to {args.rejects or os.path.splitext(args.path)[0] + '.rejects.jsonl'}")
+        sys.exit(1)
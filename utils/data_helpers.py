@@ -1,56 +1,705 @@
 import os
+import sys
 import json
+import bisect
+import logging
+import tempfile
+import threading
+from itertools import islice
+from collections import OrderedDict
+from contextlib import contextmanager
+from utils import sqlite_store, event_log
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 DATA_FOLDER = "data"
+SEQUENCES_FILE = os.path.join(DATA_FOLDER, "sequences.json")
+# "json" keeps one file per collection, "sqlite" uses the indexed store in utils/sqlite_store.py
+STORAGE_BACKEND = os.environ.get("JOBHUB_STORAGE", "json")
+# upper bound for the parsed-data cache: estimated memory of the parsed records plus their views
+CACHE_MAX_BYTES = int(os.environ.get("JOBHUB_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# on-disk format for data files: "compact" JSON, "pretty" (indented) JSON or "packed"
+CODEC = os.environ.get("JOBHUB_CODEC", "compact")
+# change logs bigger than this are folded back into their snapshot in the background
+COMPACT_LOG_BYTES = int(os.environ.get("JOBHUB_COMPACT_LOG_BYTES", 1024 * 1024))
 os.makedirs(DATA_FOLDER, exist_ok=True)
 
-def read_json(path):
-    if not os.path.exists(path):
+# the process umask, read once (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+logger = logging.getLogger(__name__)
+
+# path -> (signature, data, size, log offset, {view name: (value, apply, size)}); module level,
+# so every Streamlit session shares it. size is the estimated memory of data alone
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+_oversized = set()
+# items looked at per container when estimating memory use
+_SIZE_SAMPLE = 16
+
+# writer locks: one thread lock per path plus an advisory lock file shared with other processes
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+_held_locks = threading.local()
+_compacting = set()
+_compaction_deferred = set()
+# per-thread queue of events while inside transaction()
+_tx_state = threading.local()
+
+def _use_sqlite(path):
+    return STORAGE_BACKEND == "sqlite" and sqlite_store.collection_for(path) is not None
+
+def _use_log(path):
+    return not _use_sqlite(path) and event_log.is_logged(path)
+
+def _file_signature(*paths):
+    """(mtime, size) of each file, or None for missing files"""
+    signature = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+def data_signature(path):
+    """A cheap token that changes whenever the records read_json(path) returns change"""
+    if _use_sqlite(path):
+        # per collection, so a write to one table keeps every other table's cache
+        return sqlite_store.version(path)
+    if _use_log(path):
+        return _file_signature(path, event_log.log_path(path))
+    return _file_signature(path)
+
+def _cache_peek(path):
+    with _cache_lock:
+        return _cache.get(path)
+
+def _cache_get(path, signature):
+    with _cache_lock:
+        entry = _cache.get(path)
+        if entry is None or entry[0] != signature:
+            return None
+        _cache.move_to_end(path)
+        return entry[1]
+
+def _estimate_size(obj, depth=0, in_list=False):
+    """Rough memory use of parsed records or a view, extrapolated from a sample of each container"""
+    size = sys.getsizeof(obj)
+    if depth >= 4 or not obj or not isinstance(obj, (dict, list, tuple, set, frozenset)):
+        return size
+    if isinstance(obj, dict):
+        sample = list(islice(obj.items(), _SIZE_SAMPLE))
+        # records in a list share their key strings (the JSON decoder reuses them)
+        total = sum((0 if in_list else _estimate_size(k, depth + 1)) + _estimate_size(v, depth + 1)
+                    for k, v in sample)
+    else:
+        # spread the sample over lists, whose first records are often the oldest and smallest
+        sample = obj[::max(1, len(obj) // _SIZE_SAMPLE)][:_SIZE_SAMPLE] if isinstance(obj, (list, tuple)) \
+            else list(islice(obj, _SIZE_SAMPLE))
+        total = sum(_estimate_size(v, depth + 1, isinstance(obj, list)) for v in sample)
+    return size + total * len(obj) // len(sample)
+
+def _entry_size(entry):
+    return entry[2] + sum(view[2] for view in entry[4].values())
+
+def _evict(keep):
+    """Drop least recently used entries until the cache fits, never the entry for keep"""
+    global _cache_bytes
+    for path in list(_cache):
+        if _cache_bytes <= CACHE_MAX_BYTES:
+            return
+        if path != keep:
+            _cache_bytes -= _entry_size(_cache.pop(path))
+    if _cache_bytes > CACHE_MAX_BYTES and keep not in _oversized:
+        # keeping it alone over the bound beats re-parsing the file on every read
+        _oversized.add(keep)
+        logger.warning("Cached data for %s needs about %d MB, over JOBHUB_CACHE_MAX_BYTES (%d MB); "
+                       "keeping it as the only cache entry", keep, _cache_bytes >> 20, CACHE_MAX_BYTES >> 20)
+
+def _cache_put(path, signature, data, size, offset=0, views=None):
+    global _cache_bytes
+    with _cache_lock:
+        old = _cache.pop(path, None)
+        if old is not None:
+            _cache_bytes -= _entry_size(old)
+        entry = (signature, data, size, offset, views if views is not None else {})
+        _cache[path] = entry
+        _cache_bytes += _entry_size(entry)
+        _evict(path)
+
+def _cache_add_view(path, data, name, value, apply):
+    """Store a view next to the cached data it was built from and count its memory"""
+    global _cache_bytes
+    size = _estimate_size(value)
+    with _cache_lock:
+        entry = _cache.get(path)
+        if entry is None or entry[1] is not data:
+            return
+        entry[4][name] = (value, apply, size)
+        _cache_bytes += size
+        _evict(path)
+
+def invalidate_cache(path=None):
+    """Drop the cached copy of one file, or of everything when path is None"""
+    global _cache_bytes
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+            _cache_bytes = 0
+        else:
+            old = _cache.pop(path, None)
+            if old is not None:
+                _cache_bytes -= _entry_size(old)
+
+def _lock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+def _unlock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive writer lock for path, across threads and processes.
+
+    Re-entrant within a thread. Readers never take it: writers replace files
+    atomically, so a reader always sees either the old or the new version.
+    """
+    held = getattr(_held_locks, "paths", None)
+    if held is None:
+        held = _held_locks.paths = set()
+    if path in held:
+        yield
+        return
+
+    with _path_locks_guard:
+        lock = _path_locks.setdefault(path, threading.Lock())
+    with lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock_fd(fd)
+            held.add(path)
+            try:
+                yield
+            finally:
+                held.discard(path)
+                _unlock_fd(fd)
+        finally:
+            os.close(fd)
+
+# packed files start with this marker followed by JSON [shapes, rows]: each distinct
+# list of field names is stored once and every record becomes [shape index, *values],
+# so field names are not repeated per record; anything without the marker is read as JSON
+PACKED_MAGIC = b"JHP\x01"
+
+def _pack(records):
+    shapes, rows = {}, []
+    for record in records:
+        shape = shapes.setdefault(tuple(record), len(shapes))
+        rows.append([shape, *record.values()])
+    return [list(fields) for fields in shapes], rows
+
+def encode_records(data, codec=None):
+    """Serialise records with the given codec (defaults to CODEC)"""
+    codec = codec or CODEC
+    if codec == "packed":
+        return PACKED_MAGIC + json.dumps(_pack(data), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    if codec == "pretty":
+        text = json.dumps(data, indent=4, ensure_ascii=False)
+    else:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return text.encode("utf-8")
+
+def decode_records(raw):
+    """Parse bytes written by any codec"""
+    if raw.startswith(PACKED_MAGIC):
+        shapes, rows = json.loads(raw[len(PACKED_MAGIC):].decode("utf-8"))
+        return [dict(zip(shapes[row[0]], row[1:])) for row in rows]
+    return json.loads(raw.decode("utf-8"))
+
+def export_readable(path, out_path=None):
+    """Write an indented JSON copy of a data file for debugging; returns the output path"""
+    out_path = out_path or os.path.splitext(path)[0] + ".export.json"
+    with open(out_path, "wb") as f:
+        f.write(encode_records(read_json(path), "pretty"))
+    return out_path
+
+def _file_mode(path):
+    """Mode for a rewritten file: the existing file's, or what open() would give a new one"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+def _atomic_write(path, payload):
+    """Write bytes to a temp file next to path, fsync it and rename it into place"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        # mkstemp creates the file 0600; keep the permissions other readers (backups) rely on
+        os.chmod(tmp_path, _file_mode(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _load_file(path):
+    """
+    Records stored in an existing data file.
+
+    A file that cannot be decoded raises ValueError instead of reading as empty,
+    so the next write or compaction cannot overwrite real data with [].
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if not raw.strip():
         return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception:
+        data = decode_records(raw)
+    except Exception as e:
+        raise ValueError(f"{path} could not be decoded: {e}") from e
+    if not isinstance(data, list):
+        raise ValueError(f"{path} does not hold a list of records")
+    return data
+
+def _read_logged(path):
+    """Snapshot plus change log; only the new tail of the log is parsed when the snapshot is unchanged"""
+    signature = _file_signature(path, event_log.log_path(path))
+    data = _cache_get(path, signature)
+    if data is not None:
+        return data
+
+    entry = _cache_peek(path)
+    log_size = signature[1][1] if signature[1] else 0
+    views = {}
+    if entry is not None and entry[0][0] == signature[0] and entry[3] <= log_size:
+        base, offset = entry[1], entry[3]
+    else:
+        entry = None
+        base, offset = (_load_file(path) if signature[0] else []), 0
+    events, offset = event_log.read_events(path, offset)
+    data = event_log.apply_events(base, events) if events else base
+    if entry is not None:
+        # carry forward the views that know how to absorb new events; they (and the records)
+        # grow with the records, so scale the size estimates instead of measuring again
+        growth = len(data) / len(base) if base else 1
+        size = int(entry[2] * growth)
+        with _cache_lock:
+            carried = list(entry[4].items())
+        for name, (value, apply, view_size) in carried:
+            if apply is not None:
+                views[name] = (apply(value, base, data, events) if events else value, apply, int(view_size * growth))
+    else:
+        size = _estimate_size(data)
+    _cache_put(path, signature, data, size, offset, views)
+    return data
+
+def read_json(path):
+    """
+    Return the records stored at path.
+
+    The parsed list is cached per process and shared between sessions until the
+    file changes, so callers must treat it (and its records) as read-only.
+    """
+    if _use_sqlite(path):
+        signature = data_signature(path)
+        data = _cache_get(path, signature)
+        if data is None:
+            data = sqlite_store.read_collection(path)
+            _cache_put(path, signature, data, _estimate_size(data))
+        return data
+    if _use_log(path):
+        return _read_logged(path)
+
+    signature = _file_signature(path)
+    if signature[0] is None:
         return []
+    data = _cache_get(path, signature)
+    if data is not None:
+        return data
+    data = _load_file(path)
+    _cache_put(path, signature, data, _estimate_size(data))
+    return data
 
 def write_json(path, data):
+    if _use_sqlite(path):
+        invalidate_cache(path)
+        return sqlite_store.write_collection(path, data)
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with file_lock(path):
+            _atomic_write(path, encode_records(data))
+            if _use_log(path):
+                # the snapshot now holds everything, so the log starts over
+                event_log.truncate(path)
         return True
     except Exception:
         return False
+    finally:
+        invalidate_cache(path)
+
+def compact_log(path):
+    """Fold the change log of a logged collection into its snapshot file"""
+    with file_lock(path):
+        try:
+            if event_log.log_size(path):
+                write_json(path, read_json(path))
+        finally:
+            _compacting.discard(path)
+
+def _maybe_compact(path):
+    """Start a background compaction once the log has grown past COMPACT_LOG_BYTES"""
+    if path in _compaction_deferred or event_log.log_size(path) < COMPACT_LOG_BYTES or path in _compacting:
+        return
+    _compacting.add(path)
+    threading.Thread(target=compact_log, args=(path,), daemon=True).start()
+
+@contextmanager
+def deferred_compaction(*paths):
+    """
+    Hold off automatic compaction of paths in this process, then compact each once.
+
+    For bulk writers: every compaction rewrites and re-parses the whole collection,
+    so compacting each COMPACT_LOG_BYTES of a long import would cost O(n^2).
+    """
+    paths = [p for p in paths if _use_log(p) and p not in _compaction_deferred]
+    _compaction_deferred.update(paths)
+    try:
+        yield
+    finally:
+        _compaction_deferred.difference_update(paths)
+        for path in paths:
+            compact_log(path)
+
+def load_records(path):
+    """
+    Read the records stored at path straight from storage, bypassing the cache.
+
+    For one-off scans (imports, exports) that should not leave a whole collection,
+    and the views built on it, in memory afterwards.
+    """
+    if _use_sqlite(path):
+        return sqlite_store.read_collection(path)
+    # under the lock so a compaction cannot move events between the snapshot and the log mid-read
+    with file_lock(path):
+        records = _load_file(path) if os.path.exists(path) else []
+        if _use_log(path):
+            events, _ = event_log.read_events(path)
+            records = event_log.apply_events(records, events)
+    return records
+
+def cached_view(path, name, build, apply=None):
+    """
+    Return build(records) for the current contents of path, computed once per data version.
+
+    The result lives next to the cached records, so it is shared by every session and
+    dropped when the file changes. For logged collections an apply(value, old_records,
+    new_records, events) callback can update the view for newly appended events instead
+    of rebuilding it. Views are shared: treat them as read-only.
+    """
+    data = read_json(path)
+    entry = _cache_peek(path)
+    if entry is None or entry[1] is not data:
+        return build(data)
+    view = entry[4].get(name)
+    if view is not None:
+        return view[0]
+    value = build(data)
+    _cache_add_view(path, data, name, value, apply)
+    return value
+
+def _build_id_index(records):
+    return {r.get('id'): i for i, r in enumerate(records)}
+
+def _extend_id_index(positions, old_records, records, events):
+    # updates keep their position and inserts are appended, so only the tail is new
+    for i in range(len(old_records), len(records)):
+        positions[records[i].get('id')] = i
+    return positions
+
+def _position(records, path, record_id):
+    pos = cached_view(path, "ids", _build_id_index, _extend_id_index).get(record_id)
+    if pos is not None and pos < len(records) and records[pos].get('id') == record_id:
+        return pos
+    # only reached when records and the index come from different versions
+    return next((i for i, r in enumerate(records) if r.get('id') == record_id), None)
+
+def get_record(path, record_id):
+    """Return the record with the given id, or None"""
+    if _use_sqlite(path):
+        return sqlite_store.get(path, record_id)
+    records = read_json(path)
+    pos = _position(records, path, record_id)
+    return None if pos is None else records[pos]
+
+def get_records(path, record_ids):
+    """Return the records with the given ids, in that order, skipping ids that do not exist"""
+    if _use_sqlite(path):
+        return [r for r in (sqlite_store.get(path, i) for i in record_ids) if r is not None]
+    records = read_json(path)
+    index = cached_view(path, "ids", _build_id_index, _extend_id_index)
+    found = []
+    for record_id in record_ids:
+        pos = index.get(record_id)
+        if pos is not None and (pos >= len(records) or records[pos].get('id') != record_id):
+            pos = _position(records, path, record_id)
+        if pos is not None:
+            found.append(records[pos])
+    return found
+
+def _group_view(fields, order_field):
+    """
+    Build/apply functions for a view grouping record ids by the string values of fields,
+    each group kept sorted by (order_field, id), plus each id's current (group, sort key).
+    """
+    def entry(record):
+        return tuple(str(record.get(f)) for f in fields), (str(record.get(order_field) or ""), record.get("id"))
+
+    def build(records):
+        index = {"groups": {}, "where": {}}
+        for record in records:
+            group, key = entry(record)
+            index["groups"].setdefault(group, []).append(key)
+            index["where"][record.get("id")] = (group, key)
+        for keys in index["groups"].values():
+            keys.sort()
+        return index
+
+    def move(index, record_id, group, key):
+        old = index["where"].get(record_id)
+        if old is not None:
+            keys = index["groups"][old[0]]
+            i = bisect.bisect_left(keys, old[1])
+            if i < len(keys) and keys[i] == old[1]:
+                del keys[i]
+        index["where"][record_id] = (group, key)
+        bisect.insort(index["groups"].setdefault(group, []), key)
+
+    def apply(index, old_records, records, events):
+        for event in events:
+            if event.get("op") == "insert":
+                move(index, event["record"].get("id"), *entry(event["record"]))
+            elif event.get("op") == "update" and {*fields, order_field} & set(event.get("changes", {})):
+                record_id, changes = event.get("id"), event["changes"]
+                if record_id not in index["where"]:
+                    continue
+                group, (order, _) = index["where"][record_id]
+                group = tuple(str(changes[f]) if f in changes else g for f, g in zip(fields, group))
+                order = str(changes[order_field] or "") if order_field in changes else order
+                move(index, record_id, group, (order, record_id))
+        return index
+
+    return build, apply
+
+def find_sorted(path, order_field, offset=0, limit=None, **criteria):
+    """
+    Records matching criteria (compared as strings), newest order_field first.
+
+        find_sorted(APPLICATIONS_FILE, "applied_date", employer_id=7, status="pending", limit=20)
+
+    Served from an index on the criteria fields maintained as records are appended, so
+    the cost is proportional to the page returned rather than the whole collection.
+    """
+    stop = None if limit is None else offset + limit
+    if _use_sqlite(path):
+        records = sorted(sqlite_store.find(path, criteria),
+                         key=lambda r: (str(r.get(order_field) or ""), r.get("id")), reverse=True)
+        return records[offset:stop]
+    fields = tuple(sorted(criteria))
+    build, apply = _group_view(fields, order_field)
+    index = cached_view(path, f"by_{','.join(fields)}:{order_field}", build, apply)
+    keys = index["groups"].get(tuple(str(criteria[f]) for f in fields), [])
+    # keys run oldest first: take the page from the end
+    end = len(keys) - offset
+    page = keys[max(0, end - limit) if limit is not None else 0:max(0, end)]
+    return get_records(path, [record_id for _, record_id in reversed(page)])
+
+def next_id(path):
+    """
+    Allocate the next id for a collection from a persistent, monotonic sequence.
+
+    The sequence is seeded from the largest id already stored and is never reused,
+    even when records are removed; allocation is serialised across processes.
+    """
+    return reserve_ids(path, 1)[0]
+
+def reserve_ids(path, count):
+    """Allocate a block of count consecutive ids in one step (for bulk inserts); returns a range"""
+    name = os.path.splitext(os.path.basename(path))[0]
+
+    def seed():
+        return max((r.get('id') for r in load_records(path) if isinstance(r.get('id'), int)), default=0)
+
+    if _use_sqlite(path):
+        last = sqlite_store.next_id(name, seed, count)
+        return range(last - count + 1, last + 1)
+    with file_lock(SEQUENCES_FILE):
+        try:
+            with open(SEQUENCES_FILE, "r", encoding="utf-8") as f:
+                sequences = json.load(f)
+        except (OSError, ValueError):
+            sequences = {}
+        if name not in sequences:
+            sequences[name] = seed()
+        sequences[name] += count
+        _atomic_write(SEQUENCES_FILE, json.dumps(sequences, indent=4).encode("utf-8"))
+        return range(sequences[name] - count + 1, sequences[name] + 1)
+
+def _apply(path, events):
+    """Write a batch of insert/update events to one collection as a single durable write"""
+    if _use_sqlite(path):
+        return sqlite_store.apply_events({path: events})
+    with file_lock(path):
+        if _use_log(path):
+            ok = event_log.append(path, events)
+        else:
+            ok = write_json(path, event_log.apply_events(read_json(path), events))
+    if _use_log(path):
+        _maybe_compact(path)
+    return ok
+
+def in_transaction():
+    return getattr(_tx_state, "events", None) is not None
+
+@contextmanager
+def transaction():
+    """
+    Group record inserts and updates into one write per collection.
+
+        with transaction():
+            for app_id in app_ids:
+                update_record(APPLICATIONS_FILE, app_id, {'status': 'rejected'})
+
+    Inside the block insert_record/update_record are queued. When the block exits
+    normally each touched collection gets a single write under its lock (one log
+    append, one file replace, or one SQLite transaction for all of them); if it
+    raises nothing is written. Reads inside the block see committed data only.
+    Nested blocks join the outer transaction.
+
+    A write that fails raises OSError. Collections are written one after another,
+    so those written before the failing one keep their changes.
+    """
+    if in_transaction():
+        yield
+        return
+    _tx_state.events = {}
+    try:
+        yield
+        pending = _tx_state.events
+    finally:
+        _tx_state.events = None
+
+    sqlite_events = {path: events for path, events in pending.items() if _use_sqlite(path)}
+    if sqlite_events and not sqlite_store.apply_events(sqlite_events):
+        raise OSError(f"could not write {', '.join(sorted(sqlite_events))} to {sqlite_store.DB_PATH}")
+    # fixed order, so two transactions touching the same files cannot deadlock
+    for path in sorted(set(pending) - set(sqlite_events)):
+        if not _apply(path, pending[path]):
+            raise OSError(f"could not write {path}")
+
+def _submit(path, events):
+    if in_transaction():
+        _tx_state.events.setdefault(path, []).extend(events)
+        return True
+    return _apply(path, events)
+
+def find_records(path, **criteria):
+    """Return records whose fields match criteria (compared as strings), using indexes when the backend has them"""
+    if _use_sqlite(path):
+        return sqlite_store.find(path, criteria)
+    return [r for r in read_json(path) if all(str(r.get(k)) == str(v) for k, v in criteria.items())]
+
+def indexed_ids(path, **criteria):
+    """
+    Ids of the records matching criteria on the SQLite store's indexed columns, without
+    loading the collection; None when path is not kept in SQLite (use a cached_view then).
+    """
+    if not _use_sqlite(path):
+        return None
+    return sqlite_store.ids(path, criteria)
+
+def indexed_counts(path, field, **criteria):
+    """{value of field: record count} among records matching criteria, like indexed_ids"""
+    if not _use_sqlite(path):
+        return None
+    return sqlite_store.count_by(path, field, criteria)
+
+def insert_record(path, record):
+    """Append a single record to a collection"""
+    return _submit(path, [event_log.insert_event(record)])
 
+def update_record(path, record_id, changes):
+    """Merge changes into the record with the given id; returns the updated record or None"""
+    if in_transaction():
+        record = get_record(path, record_id)
+        if record is None:
+            return None
+        _submit(path, [event_log.update_event(record_id, changes)])
+        return {**record, **changes}
+    if _use_sqlite(path):
+        return sqlite_store.update(path, record_id, changes)
+    with file_lock(path):
+        # re-check under the lock so concurrent writers cannot lose each other's updates
+        record = get_record(path, record_id)
+        if record is None:
+            return None
+        _apply(path, [event_log.update_event(record_id, changes)])
+    return {**record, **changes}
 
 def cleanup_user_data():
     """Clean up existing user data to fix any invalid values"""
-    users = read_json("data/users.json")
-    updated = False
+    with file_lock("data/users.json"):
+        users = [dict(u) for u in read_json("data/users.json")]
+        updated = False
     
-    for i, user in enumerate(users):
-        if user.get('gender') not in ['Male', 'Female', 'Other']:
-            users[i]['gender'] = 'Male'
-            updated = True
+        for i, user in enumerate(users):
+            if user.get('gender') not in ['Male', 'Female', 'Other']:
+                users[i]['gender'] = 'Male'
+                updated = True
         
-        salary = user.get('expected_salary', 15000)
-        if not isinstance(salary, (int, float)) or salary < 5000:
-            users[i]['expected_salary'] = 15000
-            updated = True
-        elif salary > 100000:
-            users[i]['expected_salary'] = 100000
-            updated = True
+            salary = user.get('expected_salary', 15000)
+            if not isinstance(salary, (int, float)) or salary < 5000:
+                users[i]['expected_salary'] = 15000
+                updated = True
+            elif salary > 100000:
+                users[i]['expected_salary'] = 100000
+                updated = True
         
-        if user.get('experience') not in ['Fresher', '1-2 years', '2-5 years', '5+ years']:
-            users[i]['experience'] = 'Fresher'
-            updated = True
+            if user.get('experience') not in ['Fresher', '1-2 years', '2-5 years', '5+ years']:
+                users[i]['experience'] = 'Fresher'
+                updated = True
         
-        if 'availability_status' not in users[i]:
-            users[i]['availability_status'] = 'available'
-            updated = True
+            if 'availability_status' not in users[i]:
+                users[i]['availability_status'] = 'available'
+                updated = True
     
-    if updated:
-        write_json("data/users.json", users)
+        if updated:
+            write_json("data/users.json", users)
     
-    return users
\ No newline at end of file
+        return users
\ No newline at end of file
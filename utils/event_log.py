@@ -0,0 +1,95 @@
+"""
+Append-only change logs for the busy collections.
+
+users.json, applications.json, job_offers.json and jobs.json are stored as a snapshot plus a
+<name>.log.jsonl file. New records and status changes are appended to the log
+as one JSON line each, and the log is periodically folded back into the
+snapshot (see data_helpers.compact_log).
+"""
+import os
+import json
+
+LOGGED_COLLECTIONS = ("users", "applications", "job_offers", "jobs")
+
+
+def is_logged(path):
+    return os.path.splitext(os.path.basename(path))[0] in LOGGED_COLLECTIONS
+
+
+def log_path(path):
+    return os.path.splitext(path)[0] + ".log.jsonl"
+
+
+def insert_event(record):
+    return {"op": "insert", "record": record}
+
+
+def update_event(record_id, changes):
+    return {"op": "update", "id": record_id, "changes": changes}
+
+
+def append(path, events):
+    """Append events to the collection's log in a single write"""
+    lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+    try:
+        with open(log_path(path), "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def read_events(path, offset=0):
+    """Return the complete events after byte offset and the offset just past them"""
+    try:
+        with open(log_path(path), "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except OSError:
+        return [], 0
+
+    # a writer may be half way through a line; leave it for the next read
+    end = chunk.rfind(b"\n") + 1
+    events = []
+    for line in chunk[:end].splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events, offset + end
+
+
+def apply_events(records, events):
+    """Return a new list with events folded into records (records are left untouched)"""
+    records = list(records)
+    positions = {r.get("id"): i for i, r in enumerate(records)}
+    for event in events:
+        if event.get("op") == "insert":
+            record = event["record"]
+            pos = positions.get(record.get("id"))
+            # inserts act as upserts so replaying a log twice is harmless
+            if pos is None:
+                positions[record.get("id")] = len(records)
+                records.append(record)
+            else:
+                records[pos] = record
+        elif event.get("op") == "update":
+            pos = positions.get(event.get("id"))
+            if pos is not None:
+                records[pos] = {**records[pos], **event.get("changes", {})}
+    return records
+
+
+def log_size(path):
+    try:
+        return os.path.getsize(log_path(path))
+    except OSError:
+        return 0
+
+
+def truncate(path):
+    if os.path.exists(log_path(path)):
+        with open(log_path(path), "w", encoding="utf-8"):
+            pass
@@ -0,0 +1,14 @@
+"""
+Write readable (indented JSON) copies of data files, whatever codec they are stored in.
+
+    python -m utils.export_data data/users.json [data/applications.json ...]
+
+Each file is exported next to the original as <name>.export.json.
+"""
+import sys
+from utils.data_helpers import export_readable
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        print(f"{path} -> {export_readable(path)}")
@@ -1,40 +1,261 @@
-from utils.data_helpers import read_json, write_json
+from utils.data_helpers import read_json, write_json, find_records, find_sorted, get_record, insert_record, next_id, file_lock, cached_view, data_signature
 import os
-import streamlit as st
+from types import MappingProxyType
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from collections import Counter
 from datetime import datetime, timedelta
 
 DATA_FOLDER = "data"
 DEMO_JOBS_FILE = os.path.join(DATA_FOLDER, "demo_jobs.json")
+JOBS_FILE = os.path.join(DATA_FOLDER, "jobs.json")
+USERS_FILE = os.path.join(DATA_FOLDER, "users.json")
+APPLICATIONS_FILE = os.path.join(DATA_FOLDER, "applications.json")
+
+DEFAULT_CATEGORIES = ["Cook", "Maid", "Plumber", "Electrician", "Babysitter", "Gardener", "Driver", "Cleaner", "Security Guard"]
+DEMO_EMPLOYER = MappingProxyType({'id': 'demo', 'name': 'Demo Employer', 'email': 'demo@jobconnect.com'})
+EMPLOYER_FIELDS = ('role', 'name', 'company_name', 'phone', 'email')
+
+# ((jobs signature, demo jobs signature, employer view, employer view version), feed) for the last feed built
+_feed = None
 
 def get_job_offers():
     """Get all job offers"""
     return read_json("data/job_offers.json")
 
 def save_demo_job(job: dict) -> bool:
-    jobs = get_demo_jobs()
-    job['id'] = len(jobs) + 1
-    jobs.append(job)
-    return write_json(DEMO_JOBS_FILE, jobs)
+    job['id'] = next_id(DEMO_JOBS_FILE)
+    return insert_record(DEMO_JOBS_FILE, job)
+
+def get_active_jobs():
+    """Get every active job posting"""
+    return find_records(JOBS_FILE, status='active')
+
+def get_employer_jobs(employer_id):
+    """Get all job postings of one employer, newest first"""
+    return find_sorted(JOBS_FILE, "posted_date", employer_id=employer_id)
 
 def add_job_posting(employer_id, job_data):
     """Add a new job posting for employer"""
-    users = read_json("data/users.json")
-    for i, user in enumerate(users):
-        if user.get('id') == employer_id and user.get('role') == 'hire':
-            if 'job_postings' not in users[i]:
-                users[i]['job_postings'] = []
-            
-            job_data['id'] = len(users[i]['job_postings']) + 1
-            job_data['posted_date'] = datetime.now().isoformat()
-            job_data['status'] = 'active'
-            job_data['applications_count'] = 0
-            
-            users[i]['job_postings'].append(job_data)
-            write_json("data/users.json", users)
-            
-            st.session_state.current_user = users[i]
-            return True
-    return False
+    employer = get_record(USERS_FILE, employer_id)
+    if employer is None or employer.get('role') != 'hire':
+        return False
+
+    job_data['id'] = next_id(JOBS_FILE)
+    job_data['employer_id'] = employer_id
+    job_data['posted_date'] = datetime.now().isoformat()
+    job_data['status'] = 'active'
+    job_data['applications_count'] = 0
+    return insert_record(JOBS_FILE, job_data)
+
+def migrate_job_postings():
+    """
+    One-time move of the job_postings lists kept on employer records into jobs.json.
+
+    Postings get a global id; the old per-employer id is kept as employer_job_id and
+    applications pointing at it are re-pointed (keeping legacy_job_id). Safe to re-run.
+    """
+    with file_lock(USERS_FILE), file_lock(JOBS_FILE), file_lock(APPLICATIONS_FILE):
+        users = read_json(USERS_FILE)
+        if not any(u.get('job_postings') is not None for u in users):
+            return 0
+
+        jobs = list(read_json(JOBS_FILE))
+        migrated = {(str(j.get('employer_id')), j.get('employer_job_id')): j['id']
+                    for j in jobs if 'employer_job_id' in j}
+        moved = 0
+        for user in users:
+            for posting in user.get('job_postings') or []:
+                key = (str(user['id']), posting.get('id'))
+                if key in migrated:
+                    continue
+                job_id = next_id(JOBS_FILE)
+                jobs.append({**posting, 'id': job_id, 'employer_id': user['id'], 'employer_job_id': posting.get('id')})
+                migrated[key] = job_id
+                moved += 1
+
+        applications = []
+        for app in read_json(APPLICATIONS_FILE):
+            new_id = migrated.get((str(app.get('employer_id')), app.get('job_id')))
+            if new_id is not None and 'legacy_job_id' not in app:
+                app = {**app, 'job_id': new_id, 'legacy_job_id': app.get('job_id')}
+            applications.append(app)
+
+        # jobs first: a crash part way leaves postings on the users, and the next run skips the ones already moved
+        write_json(JOBS_FILE, jobs)
+        write_json(APPLICATIONS_FILE, applications)
+        write_json(USERS_FILE, [{k: v for k, v in u.items() if k != 'job_postings'} for u in users])
+        return moved
 
 def get_demo_jobs() -> list:
-    return read_json(DEMO_JOBS_FILE)
\ No newline at end of file
+    return read_json(DEMO_JOBS_FILE)
+
+def _employer_info(user):
+    return MappingProxyType({
+        'id': user['id'],
+        'name': user.get('name'),
+        'company': user.get('company_name', 'Company'),
+        'phone': user.get('phone'),
+        'email': user.get('email'),
+    })
+
+def _build_employer_info(users):
+    """Employer id -> the employer_info shown on job cards, with a counter bumped whenever one changes"""
+    return {"info": {u['id']: _employer_info(u) for u in users if u.get('role') == 'hire'}, "version": 0}
+
+def _update_employer_info(index, old_users, users, events):
+    info = index["info"]
+    for event in events:
+        if event.get('op') == 'insert':
+            user = event['record']
+            if user.get('role') == 'hire':
+                info[user['id']] = _employer_info(user)
+            elif info.pop(user.get('id'), None) is None:
+                continue
+        elif event.get('op') == 'update' and event.get('id') in info and set(EMPLOYER_FIELDS) & set(event.get('changes', {})):
+            changes, current = event['changes'], info[event['id']]
+            if changes.get('role', 'hire') != 'hire':
+                del info[event['id']]
+            else:
+                info[event['id']] = _employer_info({
+                    'id': event['id'],
+                    'name': changes.get('name', current['name']),
+                    'company_name': changes.get('company_name', current['company']),
+                    'phone': changes.get('phone', current['phone']),
+                    'email': changes.get('email', current['email']),
+                })
+        else:
+            continue
+        index["version"] += 1
+    return index
+
+def _job_categories(job):
+    job_types = job.get('job_types', [])
+    if isinstance(job_types, str):
+        job_types = [job_types]
+    return [jt.strip().lower() for jt in job_types if jt]
+
+def _build_feed(jobs, demo_jobs, employers):
+    feed = []
+    for job in demo_jobs:
+        feed.append(MappingProxyType({**job, 'employer_info': MappingProxyType(
+            {**DEMO_EMPLOYER, 'company': job.get('company'), 'phone': job.get('contact')})}))
+    for job in jobs:
+        employer = employers.get(job.get('employer_id'))
+        if job.get('status') == 'active' and employer is not None:
+            feed.append(MappingProxyType({**job, 'employer_info': employer}))
+
+    # facet -> each job's value(s) by position (always a tuple; a job can have several categories)
+    keys = {
+        'location': tuple((job.get('location', 'Not specified'),) for job in feed),
+        'category': tuple(tuple(dict.fromkeys(_job_categories(job))) for job in feed),
+        'company': tuple((job['employer_info']['company'],) for job in feed),
+    }
+    # facet -> value -> positions of the jobs that have it, and the jobs themselves
+    index, jobs_by = {}, {}
+    for facet, column in keys.items():
+        postings = {}
+        for pos, job_keys in enumerate(column):
+            for v in job_keys:
+                postings.setdefault(v, []).append(pos)
+        index[facet] = MappingProxyType({v: frozenset(p) for v, p in postings.items()})
+        jobs_by[facet] = MappingProxyType({v: tuple(feed[i] for i in p) for v, p in postings.items()})
+
+    # (facet, other facet) -> other facet's value -> counts of facet values among those jobs,
+    # so the common case of a single active filter needs no counting at all
+    cross = {}
+    for facet in keys:
+        for other in keys:
+            if other != facet:
+                table = cross[(facet, other)] = {}
+                for mine, theirs in zip(keys[facet], keys[other]):
+                    for o in theirs:
+                        tally = table.setdefault(o, {})
+                        for v in mine:
+                            tally[v] = tally.get(v, 0) + 1
+
+    categories = {c.lower() for c in DEFAULT_CATEGORIES} | set(index['category'])
+    salaries = [job.get('salary', 0) or 0 for job in feed if 'salary' in job]
+    # positions sorted by salary, with the salaries alongside for bisecting
+    by_salary = sorted(range(len(feed)), key=lambda pos: feed[pos].get('salary', 0) or 0)
+    return MappingProxyType({
+        'jobs': tuple(feed),
+        # display name -> lower-cased category used for matching
+        'categories': MappingProxyType({c.title(): c for c in sorted(categories, key=str.title)}),
+        'locations': tuple(sorted(index['location'])),
+        'companies': tuple(sorted(index['company'])),
+        'min_salary': min(salaries, default=0),
+        'max_salary': max(salaries, default=0),
+        'salaries': tuple(feed[pos].get('salary', 0) or 0 for pos in by_salary),
+        'salary_positions': tuple(by_salary),
+        'keys': MappingProxyType(keys),
+        'index': MappingProxyType(index),
+        'jobs_by': MappingProxyType(jobs_by),
+        'cross': MappingProxyType(cross),
+        'counts': MappingProxyType({facet: MappingProxyType({v: len(p) for v, p in postings.items()})
+                                    for facet, postings in index.items()}),
+    })
+
+def _intersect(sets):
+    """Intersection of sets (smallest first), or None when there is nothing to narrow by"""
+    if not sets:
+        return None
+    sets = sorted(sets, key=len)
+    return sets[0].intersection(*sets[1:])
+
+def filter_jobs(feed, location="All", category="All", company="All", salary_range=None):
+    """
+    Jobs in a feed matching the selected facets, and live counts for every facet value.
+
+    category is the lower-cased category. Each facet's counts apply the other filters
+    but not its own, so the numbers next to a dropdown's options are what picking that
+    option would give. Returns (jobs, {facet: {value: count}}).
+    """
+    selected = {'location': location, 'category': category, 'company': company}
+    narrowed = {facet: feed['index'][facet].get(value, frozenset())
+                for facet, value in selected.items() if value != "All"}
+    lo, hi = salary_range or (feed['min_salary'], feed['max_salary'])
+    if lo > feed['min_salary'] or hi < feed['max_salary']:
+        start = bisect_left(feed['salaries'], lo)
+        narrowed['salary'] = frozenset(feed['salary_positions'][start:bisect_right(feed['salaries'], hi, start)])
+
+    if not narrowed:
+        jobs = feed['jobs']
+    elif len(narrowed) == 1 and 'salary' not in narrowed:
+        (facet, _), = narrowed.items()
+        jobs = feed['jobs_by'][facet].get(selected[facet], ())
+    else:
+        jobs = tuple(feed['jobs'][pos] for pos in sorted(_intersect(list(narrowed.values()))))
+
+    counts = {}
+    for facet in selected:
+        others = [f for f in narrowed if f != facet]
+        if not others:
+            counts[facet] = feed['counts'][facet]
+            continue
+        if len(others) == 1 and others[0] != 'salary':
+            counts[facet] = feed['cross'][(facet, others[0])].get(selected[others[0]], {})
+            continue
+        base = _intersect([narrowed[f] for f in others])
+        counts[facet] = Counter(chain.from_iterable(map(feed['keys'][facet].__getitem__, base)))
+    return jobs, counts
+
+def get_job_feed():
+    """
+    Active and demo jobs with employer_info joined in, plus the dashboard's facet options.
+
+    The feed is rebuilt only when jobs, demo jobs or an employer's card details change,
+    and is shared by every session, so it is read-only: a tuple of read-only mappings.
+    """
+    global _feed
+    # signatures are taken before reading, so a write in between only costs an extra rebuild
+    signatures = (data_signature(JOBS_FILE), data_signature(DEMO_JOBS_FILE))
+    employers = cached_view(USERS_FILE, "employer_info", _build_employer_info, _update_employer_info)
+    cached = _feed
+    if cached is not None and cached[0][:2] == signatures and cached[0][2] is employers \
+            and cached[0][3] == employers["version"]:
+        return cached[1]
+    key = signatures + (employers, employers["version"])
+    feed = _build_feed(read_json(JOBS_FILE), get_demo_jobs(), employers["info"])
+    _feed = (key, feed)
+    return feed
@@ -0,0 +1,93 @@
+"""
+Versioned, run-once data migrations.
+
+    python -m utils.migrations
+
+The data directory records the schema version it has been migrated to in
+data/schema_version.json. Each migration below runs once, in order, under a
+lock, and the version is saved after each step, so a deploy script (or the
+first session of a new process, via ensure_migrated) can bring the data up to
+date without ordinary sessions ever touching it.
+"""
+import os
+import json
+from datetime import datetime
+from utils.data_helpers import read_json, write_json, file_lock, cleanup_user_data, _atomic_write
+from utils.jobs import migrate_job_postings
+from utils.auth import calculate_profile_completion
+
+DATA_FOLDER = "data"
+SCHEMA_FILE = os.path.join(DATA_FOLDER, "schema_version.json")
+USERS_FILE = os.path.join(DATA_FOLDER, "users.json")
+
+_checked = False
+
+
+def backfill_user_fields():
+    """Store profile_completion and a version counter on users saved before they existed"""
+    with file_lock(USERS_FILE):
+        users = read_json(USERS_FILE)
+        if all(isinstance(u.get('profile_completion'), int) and 'version' in u for u in users):
+            return
+        write_json(USERS_FILE, [{**u,
+                                 'profile_completion': calculate_profile_completion(u),
+                                 'version': u.get('version', 1)} for u in users])
+
+
+# (version, description, function); append new steps at the end, never renumber
+MIGRATIONS = [
+    (1, "normalise gender, salary, experience and availability on users", cleanup_user_data),
+    (2, "move job_postings from users into jobs.json", migrate_job_postings),
+    (3, "store profile_completion and version on users", backfill_user_fields),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _read_schema():
+    try:
+        with open(SCHEMA_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": 0, "applied": []}
+
+
+def current_version():
+    return _read_schema().get("version", 0)
+
+
+def run_migrations():
+    """Apply every pending migration; returns the versions that were applied"""
+    applied = []
+    with file_lock(SCHEMA_FILE):
+        schema = _read_schema()
+        for version, description, migrate in MIGRATIONS:
+            if version <= schema.get("version", 0):
+                continue
+            migrate()
+            schema["version"] = version
+            schema.setdefault("applied", []).append({
+                "version": version,
+                "description": description,
+                "applied_at": datetime.now().isoformat(),
+            })
+            _atomic_write(SCHEMA_FILE, json.dumps(schema, indent=4).encode("utf-8"))
+            applied.append(version)
+    return applied
+
+
+def ensure_migrated():
+    """Bring the data up to date once per process; later calls do nothing"""
+    global _checked
+    if _checked:
+        return
+    if current_version() < LATEST_VERSION:
+        run_migrations()
+    _checked = True
+
+
+if __name__ == "__main__":
+    versions = run_migrations()
+    if versions:
+        print(f"Applied migrations {versions}; schema is now at version {current_version()}")
+    else:
+        print(f"Nothing to do; schema is at version {current_version()}")
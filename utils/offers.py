@@ -1,9 +1,20 @@
 import os
+import time
+import logging
+import bisect
+import threading
 from datetime import datetime, timedelta
-from utils.data_helpers import read_json, write_json
+from utils.data_helpers import read_json, find_sorted, get_record, insert_record, update_record, next_id, transaction, cached_view, file_lock
 
 DATA_FOLDER = "data"
 OFFERS_FILE = os.path.join(DATA_FOLDER, "job_offers.json")
+SWEEP_INTERVAL_SECONDS = int(os.environ.get("JOBHUB_SWEEP_SECONDS", 60))
+SWEEP_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+_sweeper_started = False
+_sweeper_lock = threading.Lock()
 
 def get_job_offers():
     """
@@ -11,25 +22,140 @@ def get_job_offers():
     """
     return read_json(OFFERS_FILE)
 
+def get_seeker_offers(job_seeker_id):
+    """Get offers sent to one job seeker, newest first"""
+    return find_sorted(OFFERS_FILE, "offered_date", job_seeker_id=job_seeker_id)
+
 def save_job_offer(offer_data):
     """Save a job offer from employer to job seeker"""
-    offers = read_json("data/job_offers.json")
-    offer_data['id'] = len(offers) + 1
+    offer_data['id'] = next_id(OFFERS_FILE)
     offer_data['offered_date'] = datetime.now().isoformat()
     offer_data['status'] = 'pending'
     offer_data['expires_at'] = (datetime.now() + timedelta(days=1)).isoformat()  # 24 hours
-    offers.append(offer_data)
-    write_json("data/job_offers.json", offers)
-    return True
+    return insert_record(OFFERS_FILE, offer_data)
 
 def update_offer_status(offer_id, status, response_message=""):
     """Update job offer status"""
-    offers = get_job_offers()
-    for i, offer in enumerate(offers):
-        if offer.get('id') == offer_id:
-            offers[i]['status'] = status
-            offers[i]['response_date'] = datetime.now().isoformat()
-            offers[i]['response_message'] = response_message
-            write_json("data/job_offers.json", offers)
-            return True
-    return False
\ No newline at end of file
+    updated = update_record(OFFERS_FILE, offer_id, {
+        'status': status,
+        'response_date': datetime.now().isoformat(),
+        'response_message': response_message,
+    })
+    return updated is not None
+
+def _expiry_ts(offer):
+    try:
+        return datetime.fromisoformat(offer['expires_at']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return float('inf')
+
+def _build_expiry_index(offers):
+    """
+    Pending offers by expiry: {id: timestamp} plus a time-ordered [(timestamp, id)] list.
+
+    Entries are only ever appended to the list; ids that stop being pending are dropped
+    from the dict and skipped lazily, like deleted entries in a heap.
+    """
+    expiry = {o.get('id'): _expiry_ts(o) for o in offers if o.get('status') == 'pending'}
+    return expiry, sorted((ts, offer_id) for offer_id, ts in expiry.items())
+
+def _update_expiry_index(index, old_offers, offers, events):
+    expiry, ordered = index
+    for event in events:
+        if event.get('op') == 'insert' and event['record'].get('status') == 'pending':
+            offer = event['record']
+            expiry[offer.get('id')] = _expiry_ts(offer)
+            bisect.insort(ordered, (expiry[offer.get('id')], offer.get('id')))
+        elif event.get('op') == 'update' and event.get('changes', {}).get('status', 'pending') != 'pending':
+            expiry.pop(event.get('id'), None)
+    return index
+
+def _expiry_index():
+    return cached_view(OFFERS_FILE, "pending_expiry", _build_expiry_index, _update_expiry_index)
+
+def offer_expires_in(offer, now=None):
+    """Seconds until a pending offer expires (negative once expired), without re-parsing its timestamp"""
+    now = now or time.time()
+    ts = _expiry_index()[0].get(offer.get('id'))
+    return (ts if ts is not None else _expiry_ts(offer)) - now
+
+def is_offer_expired(offer, now=None):
+    if offer.get('status') == 'expired':
+        return True
+    return offer.get('status') == 'pending' and offer_expires_in(offer, now) < 0
+
+def get_live_offers(job_seeker_id, now=None):
+    """Pending offers for a job seeker that have not expired yet"""
+    now = now or time.time()
+    expiry = _expiry_index()[0]
+    return [o for o in get_seeker_offers(job_seeker_id)
+            if o.get('id') in expiry and expiry[o.get('id')] >= now]
+
+def expire_offers(now=None, batch_size=SWEEP_BATCH_SIZE):
+    """Mark every pending offer past its expires_at as 'expired'; returns how many were changed"""
+    now = now or time.time()
+    expiry, ordered = _expiry_index()
+    cut = bisect.bisect_right(ordered, (now, float('inf')))
+    due = [offer_id for ts, offer_id in ordered[:cut] if expiry.get(offer_id) == ts]
+
+    expired_at = datetime.fromtimestamp(now).isoformat()
+    changed = 0
+    for start in range(0, len(due), batch_size):
+        # hold the writer lock from the status check to the commit, so an accept or
+        # decline landing in between cannot be overwritten with 'expired'
+        with file_lock(OFFERS_FILE), transaction():
+            for offer_id in due[start:start + batch_size]:
+                offer = get_record(OFFERS_FILE, offer_id)
+                if offer and offer.get('status') == 'pending':
+                    update_record(OFFERS_FILE, offer_id, {'status': 'expired', 'response_date': expired_at})
+                    changed += 1
+    return changed
+
+def _offered_ts(offer):
+    try:
+        return datetime.fromisoformat(offer['offered_date']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _build_latest_offer_index(offers):
+    """{(employer_id, job_seeker_id): timestamp of the newest offer}, ids as strings"""
+    latest = {}
+    for offer in offers:
+        _record_offer(latest, offer)
+    return latest
+
+def _record_offer(latest, offer):
+    ts = _offered_ts(offer)
+    if ts is not None:
+        key = (str(offer.get('employer_id')), str(offer.get('job_seeker_id')))
+        if ts > latest.get(key, float('-inf')):
+            latest[key] = ts
+
+def _update_latest_offer_index(latest, old_offers, offers, events):
+    for event in events:
+        if event.get('op') == 'insert':
+            _record_offer(latest, event['record'])
+    return latest
+
+def latest_offer_time(employer_id, job_seeker_id):
+    """Timestamp of the newest offer this employer sent this job seeker, or None"""
+    latest = cached_view(OFFERS_FILE, "latest_offer", _build_latest_offer_index, _update_latest_offer_index)
+    return latest.get((str(employer_id), str(job_seeker_id)))
+
+def _sweep_forever(interval):
+    while True:
+        try:
+            expire_offers()
+        except Exception:
+            # keep sweeping, but a corrupt file or failed write must not go unnoticed
+            logger.exception("Offer expiry sweep failed; retrying in %s seconds", interval)
+        time.sleep(interval)
+
+def start_expiry_sweeper(interval=SWEEP_INTERVAL_SECONDS):
+    """Start the background offer-expiry sweeper once per process"""
+    global _sweeper_started
+    with _sweeper_lock:
+        if _sweeper_started:
+            return
+        _sweeper_started = True
+    threading.Thread(target=_sweep_forever, args=(interval,), daemon=True, name="offer-expiry-sweeper").start()
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Password hashing with scrypt.
+
+Hashes are stored as "scrypt$<n>$<r>$<p>$<salt>$<hash>" (salt and hash base64),
+so the work factor can be raised later without breaking existing records.
+Records that still hold a plaintext password are accepted once and rehashed at
+login (see utils.auth.authenticate).
+
+The KDF is deliberately slow, so it runs on a small shared thread pool: hashlib
+releases the GIL while it works, and the pool bounds how many CPUs logins can
+take at once, so a burst of logins cannot starve every other session.
+"""
+import os
+import hmac
+import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# cost parameters for new hashes; each doubling of N doubles the time per login
+SCRYPT_N = int(os.environ.get("JOBHUB_SCRYPT_N", 2 ** 14))
+SCRYPT_R = int(os.environ.get("JOBHUB_SCRYPT_R", 8))
+SCRYPT_P = int(os.environ.get("JOBHUB_SCRYPT_P", 1))
+KDF_WORKERS = int(os.environ.get("JOBHUB_KDF_WORKERS", 4))
+PREFIX = "scrypt$"
+
+_pool = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix="password-kdf")
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=32)
+
+
+def _hash(password, n=None, r=None, p=None):
+    n, r, p = n or SCRYPT_N, r or SCRYPT_R, p or SCRYPT_P
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, n, r, p)
+    return PREFIX + "$".join([str(n), str(r), str(p),
+                              base64.b64encode(salt).decode(), base64.b64encode(digest).decode()])
+
+
+def _verify(password, stored):
+    if not is_hashed(stored):
+        # legacy plaintext; a missing, empty or non-string password never matches
+        if not isinstance(stored, str) or not stored or not isinstance(password, str):
+            return False
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    try:
+        n, r, p, salt, digest = stored[len(PREFIX):].split("$")
+        expected = base64.b64decode(digest)
+        return hmac.compare_digest(_scrypt(password, base64.b64decode(salt), int(n), int(r), int(p)), expected)
+    except (ValueError, TypeError):
+        return False
+
+
+def is_hashed(stored):
+    return isinstance(stored, str) and stored.startswith(PREFIX)
+
+
+def is_valid_hash(stored):
+    """True only for a well-formed scrypt$ hash this module can verify, with sane cost parameters"""
+    if not is_hashed(stored):
+        return False
+    try:
+        n, r, p, salt, digest = stored[len(PREFIX):].split("$")
+        n, r, p = int(n), int(r), int(p)
+        salt, digest = base64.b64decode(salt, validate=True), base64.b64decode(digest, validate=True)
+    except (ValueError, TypeError):
+        return False
+    return (2 <= n <= 2 ** 20 and n & (n - 1) == 0 and 1 <= r <= 32 and 1 <= p <= 16
+            and len(salt) >= 16 and len(digest) == 32)
+
+
+def needs_rehash(stored):
+    """True for plaintext records and hashes made with other cost parameters"""
+    if not is_hashed(stored):
+        return True
+    return stored[len(PREFIX):].split("$")[:3] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+
+
+def hash_password(password):
+    """Hash a password on the KDF pool"""
+    return _pool.submit(_hash, password).result()
+
+
+def hash_passwords(passwords):
+    """Hash many passwords at once, spread across the KDF pool (for bulk imports)"""
+    return list(_pool.map(_hash, passwords))
+
+
+def verify_password(password, stored):
+    """Check a password against a stored hash (or legacy plaintext) on the KDF pool"""
+    return _pool.submit(_verify, password, stored).result()
@@ -0,0 +1,51 @@
+"""
+Import the JSON data files into the SQLite store.
+
+    python -m utils.sqlite_import [data_dir]
+
+Run it once before starting the app with JOBHUB_STORAGE=sqlite.
+Collections that already exist in the database are replaced. Logged
+collections are read as snapshot plus change log, exactly as the JSON
+storage sees them, and the import fails if the database ends up with a
+different number of records than the files hold.
+"""
+import os
+import sys
+from utils import sqlite_store, event_log
+from utils.data_helpers import _load_file
+
+
+def read_source(path):
+    """The records the JSON storage holds for path: the snapshot with its change log applied"""
+    records = _load_file(path) if os.path.exists(path) else []
+    if event_log.is_logged(path):
+        events, _ = event_log.read_events(path)
+        records = event_log.apply_events(records, events)
+    return records
+
+
+def import_json_files(data_dir=sqlite_store.DATA_FOLDER):
+    """Copy every known data/<collection>.json file into the SQLite database"""
+    counts = {}
+    for name in sqlite_store.COLLECTIONS:
+        path = os.path.join(data_dir, f"{name}.json")
+        if not os.path.exists(path) and not os.path.exists(event_log.log_path(path)):
+            continue
+        records = read_source(path)
+        if not sqlite_store.write_collection(path, records):
+            raise RuntimeError(f"{name}: writing {len(records)} records to {sqlite_store.DB_PATH} failed")
+        imported = sqlite_store.count(path)
+        if imported != len(records):
+            raise RuntimeError(f"{name}: {len(records)} records in {data_dir} but {imported} in {sqlite_store.DB_PATH}")
+        counts[name] = imported
+    return counts
+
+
+if __name__ == "__main__":
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else sqlite_store.DATA_FOLDER
+    try:
+        counts = import_json_files(data_dir)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"Import failed: {e}")
+    for name, count in counts.items():
+        print(f"{name}: {count} records imported into {sqlite_store.DB_PATH}")
@@ -0,0 +1,232 @@
+import os
+import json
+import sqlite3
+import threading
+from utils.validation import normalize_phone
+
+DATA_FOLDER = "data"
+DB_PATH = os.environ.get("JOBHUB_SQLITE_PATH", os.path.join(DATA_FOLDER, "jobhub.db"))
+
+# collection name -> fields that get their own indexed column
+COLLECTIONS = {
+    "users": ("role",),
+    "applications": ("employer_id", "applicant_id", "status"),
+    "job_offers": ("employer_id", "job_seeker_id"),
+    "demo_jobs": (),
+    "jobs": ("employer_id", "status"),
+}
+# collection name -> derived lookup keys stored in their own indexed column, normalised
+# the way the login and signup checks compare them (see utils/auth.py)
+KEYS = {
+    "users": {
+        "phone_key": lambda user: normalize_phone(user.get("phone")),
+        "email_key": lambda user: str(user.get("email") or "").strip().lower(),
+        "name_key": lambda user: str(user.get("name", "")).lower(),
+    },
+}
+
+_local = threading.local()
+
+
+def collection_for(path):
+    """Map a data file path like data/users.json to its collection name"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return name if name in COLLECTIONS else None
+
+
+def _column_value(value):
+    # ids are a mix of ints and strings ("demo"), so index them as text
+    return None if value is None else str(value)
+
+
+def _columns(name):
+    return COLLECTIONS[name] + tuple(KEYS.get(name, ()))
+
+
+def _column(name, column, record):
+    key = KEYS.get(name, {}).get(column)
+    if key is not None:
+        return key(record) or None
+    return _column_value(record.get(column))
+
+
+def _create_schema(conn):
+    # take the write lock first so concurrent first connections do not both add columns
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    for name in COLLECTIONS:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (seq INTEGER PRIMARY KEY AUTOINCREMENT, id, data TEXT NOT NULL)")
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({name})")}
+        added = [column for column in _columns(name) if column not in existing]
+        for column in added:
+            conn.execute(f"ALTER TABLE {name} ADD COLUMN {column} TEXT")
+        if added:
+            # a database from an older version: fill the new columns in from the stored records
+            assignments = ", ".join(f"{column} = ?" for column in added)
+            rows = conn.execute(f"SELECT seq, data FROM {name}").fetchall()
+            conn.executemany(f"UPDATE {name} SET {assignments} WHERE seq = ?",
+                             ([_column(name, column, json.loads(data)) for column in added] + [seq]
+                              for seq, data in rows))
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_id ON {name} (id)")
+        for column in _columns(name):
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{column} ON {name} ({column})")
+    conn.commit()
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _create_schema(conn)
+        _local.conn = conn
+    return conn
+
+
+def _row_values(name, record):
+    return ([record.get("id"), json.dumps(record, ensure_ascii=False)]
+            + [_column(name, column, record) for column in _columns(name)])
+
+
+def _insert_sql(name):
+    columns = ("id", "data") + _columns(name)
+    return f"INSERT INTO {name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+def _bump(conn, name):
+    """Advance a collection's change counter, inside the transaction that changes it"""
+    conn.execute("INSERT INTO versions (name, value) VALUES (?, 1) "
+                 "ON CONFLICT (name) DO UPDATE SET value = value + 1", (name,))
+
+
+def version(path):
+    """
+    A token that changes whenever the collection at path does, and only then.
+
+    Writes to other collections leave it alone, so caches of one collection survive
+    writes to the rest. The database file's inode covers it being replaced wholesale.
+    """
+    conn = _connect()
+    row = conn.execute("SELECT value FROM versions WHERE name = ?", (collection_for(path),)).fetchone()
+    return os.stat(DB_PATH).st_ino, row[0] if row else 0
+
+
+def read_collection(path):
+    """Return every record of a collection in insertion order"""
+    name = collection_for(path)
+    rows = _connect().execute(f"SELECT data FROM {name} ORDER BY seq")
+    return [json.loads(data) for (data,) in rows]
+
+
+def write_collection(path, records):
+    """Replace the whole collection with records"""
+    name = collection_for(path)
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute(f"DELETE FROM {name}")
+            conn.executemany(_insert_sql(name), (_row_values(name, r) for r in records))
+            _bump(conn, name)
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def count(path):
+    """Number of records in a collection"""
+    return _connect().execute(f"SELECT COUNT(*) FROM {collection_for(path)}").fetchone()[0]
+
+
+def ids(path, criteria):
+    """Ids of the records whose indexed columns (COLLECTIONS fields or KEYS) equal criteria, in insertion order"""
+    name = collection_for(path)
+    where = " AND ".join(f"{column} = ?" for column in criteria) or "1"
+    rows = _connect().execute(f"SELECT id FROM {name} WHERE {where} ORDER BY seq",
+                              [_column_value(v) for v in criteria.values()])
+    return [record_id for (record_id,) in rows]
+
+
+def count_by(path, column, criteria):
+    """{value of an indexed column: number of records} among those whose indexed columns equal criteria"""
+    name = collection_for(path)
+    where = " AND ".join(f"{c} = ?" for c in criteria) or "1"
+    rows = _connect().execute(f"SELECT {column}, COUNT(*) FROM {name} WHERE {where} GROUP BY {column}",
+                              [_column_value(v) for v in criteria.values()])
+    return dict(rows.fetchall())
+
+
+def find(path, criteria):
+    """Return records matching criteria, pushing indexed fields down to SQL"""
+    name = collection_for(path)
+    indexed = {k: v for k, v in criteria.items() if k in COLLECTIONS[name]}
+    rest = {k: v for k, v in criteria.items() if k not in indexed}
+
+    where = " AND ".join(f"{field} = ?" for field in indexed) or "1"
+    rows = _connect().execute(f"SELECT data FROM {name} WHERE {where} ORDER BY seq",
+                              [_column_value(v) for v in indexed.values()])
+    records = [json.loads(data) for (data,) in rows]
+    if rest:
+        records = [r for r in records if all(str(r.get(k)) == str(v) for k, v in rest.items())]
+    return records
+
+
+def get(path, record_id):
+    """Return the record with the given id, or None"""
+    name = collection_for(path)
+    row = _connect().execute(f"SELECT data FROM {name} WHERE id = ?", (record_id,)).fetchone()
+    return None if row is None else json.loads(row[0])
+
+
+def next_id(name, seed, count=1):
+    """Advance the named sequence by count and return its new value; seed() gives its start value the first time"""
+    conn = _connect()
+    with conn:
+        # take the write lock before reading so concurrent allocators queue up
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT value FROM sequences WHERE name = ?", (name,)).fetchone()
+        value = (row[0] if row else seed()) + count
+        conn.execute("INSERT OR REPLACE INTO sequences (name, value) VALUES (?, ?)", (name, value))
+    return value
+
+
+def _update(conn, name, record_id, changes):
+    row = conn.execute(f"SELECT seq, data FROM {name} WHERE id = ?", (record_id,)).fetchone()
+    if row is None:
+        return None
+    seq, data = row
+    record = json.loads(data)
+    record.update(changes)
+    values = _row_values(name, record)
+    assignments = ", ".join(f"{c} = ?" for c in ("id", "data") + _columns(name))
+    conn.execute(f"UPDATE {name} SET {assignments} WHERE seq = ?", values + [seq])
+    _bump(conn, name)
+    return record
+
+
+def update(path, record_id, changes):
+    """Merge changes into the record with the given id and return it"""
+    conn = _connect()
+    with conn:
+        return _update(conn, collection_for(path), record_id, changes)
+
+
+def apply_events(batch):
+    """Apply {path: [insert/update events]} in a single SQLite transaction"""
+    conn = _connect()
+    try:
+        with conn:
+            for path, events in batch.items():
+                name = collection_for(path)
+                if events:
+                    _bump(conn, name)
+                for event in events:
+                    if event.get("op") == "insert":
+                        conn.execute(_insert_sql(name), _row_values(name, event["record"]))
+                    elif event.get("op") == "update":
+                        _update(conn, name, event.get("id"), event.get("changes", {}))
+        return True
+    except sqlite3.Error:
+        return False
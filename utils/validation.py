@@ -1,7 +1,24 @@
+# choices offered by the profile forms; imported records must use the same values
+GENDER_OPTIONS = ["Male", "Female", "Other"]
+EXPERIENCE_OPTIONS = ["Fresher", "1-2 years", "2-5 years", "5+ years"]
+JOB_TYPE_OPTIONS = ["Maid", "Cook", "Driver", "Cleaner", "Babysitter", "Gardener", "Security Guard", "Electrician", "Plumber", "Other"]
+AVAILABILITY_OPTIONS = ["Full Time", "Part Time", "Weekends", "Night Shifts"]
+EDUCATION_OPTIONS = ["Primary", "Secondary", "Higher Secondary", "Graduate", "Post Graduate"]
+LANGUAGE_OPTIONS = ["Hindi", "English", "Tamil", "Telugu", "Bengali", "Marathi", "Gujarati"]
+COMPANY_TYPE_OPTIONS = ["Family", "Small Business", "Medium Enterprise", "Large Corporation"]
+AVAILABILITY_STATUSES = ["available", "busy", "not_available"]
+MIN_SALARY, MAX_SALARY = 5000, 100000
+
+
 def validate_phone(phone: str) -> bool:
     return sum(1 for char in str(phone) if char.isdigit()) == 10
 
 
+def normalize_phone(phone) -> str:
+    """Just the digits, so "98939 22378" and "9893922378" are the same number"""
+    return "".join(char for char in str(phone or "") if char.isdigit())
+
+
 def validate_aadhaar(aadhaar: str) -> bool:
     return sum(1 for char in str(aadhaar) if char.isdigit()) == 12
 